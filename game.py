@@ -1,10 +1,14 @@
 import cv2
-import numpy as np
-import random
-import mediapipe as mp
 import pygame
-import json
 import os
+import sys
+
+# The game core (capture, detection, sprites, persistence) lives next to the 2.0 game
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game2.0'))
+from core import HandDetector, Stage, arg_value, draw_sprites, fingertips, load_json, save_json, spawn, touched
+from layout import Layout
+from leaderboard import Leaderboard, RemoteLeaderboard, format_rank, submit_scores
+from sprites import SpriteCache
 
 # Initialize pygame for background music and sound effects
 pygame.mixer.init()
@@ -16,17 +20,23 @@ try:
 except pygame.error as e:
     print(f"Could not load background music: {e}")
 
-# Initialize video capture
-cap = cv2.VideoCapture(0)
-
-# Initialize mediapipe hand detector
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=2)
-mp_draw = mp.solutions.drawing_utils
-
-# Game settings
-coin_size = 60
-bomb_size = 70
+# Camera, window and pacing (--display=sdl for the pygame/SDL backend with vsync)
+desired_screen_width = int(arg_value('width', 1280))
+camera_source = arg_value('source', '0')  # Camera index (--source=1 for an external camera) or a video file
+camera_source = int(camera_source) if camera_source.isdigit() else camera_source
+stage = Stage('AR Coin Game', source=camera_source, width=desired_screen_width,
+              backend=arg_value('display', 'opencv'), fullscreen='--fullscreen' in sys.argv)
+if not stage.open():
+    sys.exit(1)
+screen_width, screen_height = stage.size
+ui = Layout(screen_width, screen_height)
+
+# Hand detection, skipped on frames where nothing moved (--no-motion-gate to disable)
+detector = HandDetector(max_hands=2, motion_gating='--no-motion-gate' not in sys.argv)
+
+# Game settings (sizes and speeds are design pixels at 1280 wide)
+coin_size = ui.size(60)
+bomb_size = ui.size(70)
 initial_fall_speed = 3
 fall_speed = initial_fall_speed
 score = 0
@@ -40,37 +50,27 @@ HIGH_SCORE_FILE = "high_score.json"
 
 def load_high_score():
     """Load high score from file"""
-    try:
-        if os.path.exists(HIGH_SCORE_FILE):
-            with open(HIGH_SCORE_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('high_score', 0)
-    except (json.JSONDecodeError, FileNotFoundError):
-        pass
-    return 0
+    return load_json(HIGH_SCORE_FILE, {}).get('high_score', 0)
 
 def save_high_score(score):
     """Save high score to file"""
-    try:
-        data = {'high_score': score}
-        with open(HIGH_SCORE_FILE, 'w') as f:
-            json.dump(data, f)
-    except Exception as e:
-        print(f"Could not save high score: {e}")
+    save_json(HIGH_SCORE_FILE, {'high_score': score})
 
 # Load high score at startup
 high_score = load_high_score()
 final_score = 0  # Store final score when game ends
 
-# --- Load Images ---
-try:
-    coin_image = cv2.imread('coin.png', cv2.IMREAD_UNCHANGED)
-    coin_image = cv2.resize(coin_image, (coin_size, coin_size))
-    bomb_image = cv2.imread('bomb.png', cv2.IMREAD_UNCHANGED)
-    bomb_image = cv2.resize(bomb_image, (bomb_size, bomb_size))
-except Exception as e:
-    print(f"Error loading images: {e}")
-    exit()
+# Leaderboards shared with the 2.0 game's format (--leaderboard=URL for a shared server)
+LEADERBOARD_URL = arg_value('leaderboard')
+leaderboard = RemoteLeaderboard(LEADERBOARD_URL) if LEADERBOARD_URL else Leaderboard('leaderboard.jsonl')
+ranks = {}  # Leaderboard ranks of the last game (filled in when a remote server replies)
+
+# --- Load Images --- (resized once per size and cached in .sprite_cache/)
+sprite_cache = SpriteCache()
+coin_sprite = sprite_cache.load('coin.png', (coin_size, coin_size))
+bomb_sprite = sprite_cache.load('bomb.png', (bomb_size, bomb_size))
+if coin_sprite is None or bomb_sprite is None:
+    print("Error loading images, drawing plain discs instead")
 
 # --- Load Sound Effects ---
 try:
@@ -80,219 +80,137 @@ try:
 except pygame.error as e:
     print(f"Could not load sound effect: {e}")
 
-# Desired new screen width
-desired_screen_width = 1280
-
 # Function to create a random coin position
-def create_coin(screen_width):
-    x = random.randint(0, screen_width - coin_size)
-    y = 0
-    return (x, y)
+def create_coin():
+    return spawn(0, screen_width, coin_size)
 
 # Function to create a random bomb position
-def create_bomb(screen_width):
-    x = random.randint(0, screen_width - bomb_size)
-    y = 0
-    return (x, y)
-
-# Check if hand touches object (coin or bomb)
-def check_touch(obj, hand_position, obj_size):
-    obj_x, obj_y = obj
-    hand_x, hand_y = hand_position
-    distance = np.sqrt((obj_x + obj_size // 2 - hand_x)**2 + (obj_y + obj_size // 2 - hand_y)**2)
-    return distance < obj_size // 2
-
-def draw_game_over_screen(frame, current_score, high_score, is_new_high_score):
+def create_bomb():
+    return spawn(0, screen_width, bomb_size)
+
+def end_game():
+    """Record the final score and play the game over (or new high score) sound"""
+    global game_over, final_score, ranks, high_score, new_high_score_achieved
+    game_over = True
+    final_score = score
+    ranks = {}
+    submit_scores(leaderboard, {0: (score, {})}, 'classic', ranks)
+    # Check for new high score
+    if score > high_score:
+        high_score = score
+        save_high_score(high_score)
+        new_high_score_achieved = True
+        try:
+            new_high_score_sound.play()
+        except NameError:
+            pass
+    else:
+        try:
+            game_over_sound.play()
+        except NameError:
+            pass
+
+def draw_game_over_screen(frame, current_score, high_score, is_new_high_score, ranks=None):
     """Draw the game over screen with scores"""
-    frame_height, frame_width = frame.shape[:2]
-    
-    # Semi-transparent overlay
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (0, 0), (frame_width, frame_height), (0, 0, 0), -1)
-    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-    
+    # Darken the frame in place (same look as blending in a black overlay at 0.7)
+    cv2.convertScaleAbs(frame, dst=frame, alpha=0.3)
+
     # Game Over title
-    cv2.putText(frame, 'GAME OVER', (frame_width // 2 - 150, frame_height // 2 - 100), 
-                cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
-    
+    ui.text(frame, 'GAME OVER', ui.point(0.5, 0.5, -150, -100), 2, (0, 0, 255), 3)
+
     # Final Score
-    cv2.putText(frame, f'Final Score: {current_score}', (frame_width // 2 - 120, frame_height // 2 - 40), 
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    
+    ui.text(frame, f'Final Score: {current_score}', ui.point(0.5, 0.5, -120, -40), 1, (255, 255, 255), 2)
+
     # High Score
     if is_new_high_score:
-        cv2.putText(frame, 'NEW HIGH SCORE!', (frame_width // 2 - 140, frame_height // 2), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        cv2.putText(frame, f'High Score: {high_score}', (frame_width // 2 - 110, frame_height // 2 + 40), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        ui.text(frame, 'NEW HIGH SCORE!', ui.point(0.5, 0.5, -140, 0), 1, (0, 255, 0), 2)
+        ui.text(frame, f'High Score: {high_score}', ui.point(0.5, 0.5, -110, 40), 1, (0, 255, 0), 2)
     else:
-        cv2.putText(frame, f'High Score: {high_score}', (frame_width // 2 - 110, frame_height // 2 + 10), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
-    
+        ui.text(frame, f'High Score: {high_score}', ui.point(0.5, 0.5, -110, 10), 1, (255, 255, 0), 2)
+
+    # Leaderboard position
+    if ranks:
+        ui.text(frame, f'You ranked {format_rank(ranks)}', ui.point(0.5, 0.5, -130, 130), 0.8, (0, 255, 255), 2)
+
     # Restart instruction
-    cv2.putText(frame, 'Press R to Restart', (frame_width // 2 - 120, frame_height // 2 + 80), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    ui.text(frame, 'Press R to Restart', ui.point(0.5, 0.5, -120, 80), 0.8, (255, 255, 255), 2)
 
 # Initialize game variables
-screen_width = None
-screen_height = None
-coins = None
-bomb = None
+coins = [create_coin() for _ in range(num_coins)]
+bomb = create_bomb()
 bomb_falling = False
 new_high_score_achieved = False
 
 # Main game loop
 while True:
-    ret, frame = cap.read()
+    ret, frame = stage.read()
     if not ret:
         break
-    
-    frame = cv2.flip(frame, 1)
-    frame_height, frame_width = frame.shape[:2]
-
-    # Initialize game objects once we have frame dimensions
-    if screen_width is None:
-        resize_factor = desired_screen_width / frame_width
-        resized_frame_height = int(frame_height * resize_factor)
-        
-        screen_width = desired_screen_width
-        screen_height = resized_frame_height
-        
-        coins = [create_coin(screen_width) for _ in range(num_coins)]
-        bomb = create_bomb(screen_width)
-
-    # Calculate padding for display
-    resize_factor = desired_screen_width / frame_width
-    resized_frame_height = int(frame_height * resize_factor)
-
-    # Resize the frame to desired width
-    frame = cv2.resize(frame, (desired_screen_width, resized_frame_height))
 
     if not game_over:
+        # Hand detection on the clean camera frame, before anything is drawn on it
+        result_hands = detector.detect(frame)
+        hand_positions = fingertips(result_hands, screen_width, screen_height)
+
         # Increase falling speed based on the score
         fall_speed = initial_fall_speed + (score // 7)
+        step = ui.size(fall_speed)
 
-        # Overlay coin images
+        # Draw and move coins
+        draw_sprites(frame, coin_sprite, coins, coin_size, (0, 215, 255))
         for i, (coin_x, coin_y) in enumerate(coins):
-            if (coin_y >= 0 and coin_y + coin_size <= frame.shape[0] and 
-                coin_x >= 0 and coin_x + coin_size <= frame.shape[1]):
-                
-                alpha_coin = coin_image[:, :, 3] / 255.0
-                alpha_frame = 1.0 - alpha_coin
-                try:
-                    for c in range(0, 3):
-                        frame[coin_y:coin_y + coin_size, coin_x:coin_x + coin_size, c] = (
-                            alpha_coin * coin_image[:, :, c] +
-                            alpha_frame * frame[coin_y:coin_y + coin_size, coin_x:coin_x + coin_size, c])
-                except (IndexError, ValueError):
-                    pass
-            
-            coins[i] = (coin_x, coin_y + fall_speed)
-            
-            if coin_y > frame.shape[0]:
-                coins[i] = create_coin(screen_width)
+            coins[i] = (coin_x, coin_y + step)
+
+            if coin_y > screen_height:
+                coins[i] = create_coin()
                 missed_coins += 1
-                if missed_coins >= max_missed_coins:
-                    game_over = True
-                    final_score = score
-                    # Check for new high score
-                    if score > high_score:
-                        high_score = score
-                        save_high_score(high_score)
-                        new_high_score_achieved = True
-                        try:
-                            new_high_score_sound.play()
-                        except NameError:
-                            pass
-                    else:
-                        try:
-                            game_over_sound.play()
-                        except NameError:
-                            pass
+                if missed_coins >= max_missed_coins and not game_over:
+                    end_game()
 
         # Bomb logic
         if score % 2 == 0 and score > 0 and not bomb_falling:
             bomb_falling = True
-            bomb = create_bomb(screen_width)
-        
+            bomb = create_bomb()
+
         if bomb_falling:
+            draw_sprites(frame, bomb_sprite, [bomb], bomb_size, (0, 0, 255))
             bomb_x, bomb_y = bomb
-            if (bomb_y >= 0 and bomb_y + bomb_size <= frame.shape[0] and 
-                bomb_x >= 0 and bomb_x + bomb_size <= frame.shape[1]):
-                
-                alpha_bomb = bomb_image[:, :, 3] / 255.0
-                alpha_frame = 1.0 - alpha_bomb
+            bomb = (bomb_x, bomb_y + step)
+
+            if bomb_y > screen_height:
+                bomb_falling = False
+
+        # Catch coins: every fingertip against every coin in one pass
+        if hand_positions and not game_over:
+            for i in touched(hand_positions, coins, coin_size).nonzero()[0]:
+                score += 1
                 try:
-                    for c in range(0, 3):
-                        frame[bomb_y:bomb_y + bomb_size, bomb_x:bomb_x + bomb_size, c] = (
-                            alpha_bomb * bomb_image[:, :, c] +
-                            alpha_frame * frame[bomb_y:bomb_y + bomb_size, bomb_x:bomb_x + bomb_size, c])
-                except (IndexError, ValueError):
+                    coin_sound.play()
+                except NameError:
                     pass
-            
-            bomb = (bomb_x, bomb_y + fall_speed)
-            
-            if bomb_y > frame.shape[0]:
+                coins[i] = create_coin()
+
+            # Check if a hand touches the bomb
+            if bomb_falling and touched(hand_positions, [bomb], bomb_size)[0]:
+                end_game()
                 bomb_falling = False
 
-        # Hand detection
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result_hands = hands.process(rgb_frame)
-
-        if result_hands.multi_hand_landmarks:
-            for hand_landmarks in result_hands.multi_hand_landmarks:
-                index_finger_tip = hand_landmarks.landmark[8]
-                hand_x = int(index_finger_tip.x * desired_screen_width)
-                hand_y = int(index_finger_tip.y * resized_frame_height)
-                hand_position = (hand_x, hand_y)
-
-                cv2.circle(frame, (hand_x, hand_y), 5, (0, 0, 255), -1)
-                
-                # Check if hand touches any coin
-                for i, coin_position in enumerate(coins):
-                    if check_touch(coin_position, hand_position, coin_size):
-                        score += 1
-                        try:
-                            coin_sound.play()
-                        except NameError:
-                            pass
-                        coins[i] = create_coin(screen_width)
-
-                # Check if hand touches the bomb
-                if bomb_falling and check_touch(bomb, hand_position, bomb_size):
-                    game_over = True
-                    final_score = score
-                    # Check for new high score
-                    if score > high_score:
-                        high_score = score
-                        save_high_score(high_score)
-                        new_high_score_achieved = True
-                        try:
-                            new_high_score_sound.play()
-                        except NameError:
-                            pass
-                    else:
-                        try:
-                            game_over_sound.play()
-                        except NameError:
-                            pass
-                    bomb_falling = False
-                
-                mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        for hand_position in hand_positions:
+            cv2.circle(frame, hand_position, ui.size(5), (0, 0, 255), -1)
+        detector.draw(frame, result_hands)
 
         # Display current score and high score during gameplay
-        cv2.putText(frame, f'Score: {score}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-        cv2.putText(frame, f'High Score: {high_score}', (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-        cv2.putText(frame, f'Speed: {fall_speed}', (desired_screen_width - 150, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-        cv2.putText(frame, f'Missed: {missed_coins}/{max_missed_coins}', (desired_screen_width - 200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
+        ui.text(frame, f'Score: {score}', ui.point(0, 0, 10, 30), 1, (255, 0, 0), 2)
+        ui.text(frame, f'High Score: {high_score}', ui.point(0, 0, 10, 70), 0.7, (255, 255, 0), 2)
+        ui.text(frame, f'Speed: {fall_speed}', ui.point(1, 0, -150, 30), 1, (255, 0, 0), 2)
+        ui.text(frame, f'Missed: {missed_coins}/{max_missed_coins}', ui.point(1, 0, -200, 70),
+                0.7, (255, 165, 0), 2)
     else:
         # Draw game over screen with scores
-        draw_game_over_screen(frame, final_score, high_score, new_high_score_achieved)
-
-    # Show frame
-    cv2.imshow('AR Coin Game', frame)
+        draw_game_over_screen(frame, final_score, high_score, new_high_score_achieved, ranks.get(0))
 
-    key = cv2.waitKey(1) & 0xFF
+    # Show frame and handle input while waiting out the frame budget
+    key = stage.present(frame)
     if key == ord('q'):
         break
     if key == ord('r') and game_over:
@@ -302,10 +220,10 @@ while True:
         game_over = False
         fall_speed = initial_fall_speed
         new_high_score_achieved = False
-        coins = [create_coin(screen_width) for _ in range(num_coins)]
-        bomb = create_bomb(screen_width)
+        coins = [create_coin() for _ in range(num_coins)]
+        bomb = create_bomb()
         bomb_falling = False
 
 # Release resources
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+detector.close()
+stage.close()
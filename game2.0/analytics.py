@@ -0,0 +1,161 @@
+"""Offline analytics over session logs written with --log-sessions.
+
+    python analytics.py sessions/ --workers 8 --out summary.json
+
+Each session file is reduced in a worker process to fixed-shape NumPy arrays
+(catch/miss heatmaps, reaction-time and detection-latency histograms,
+difficulty curve sums), so the parent only has to add arrays together. The
+output is a small JSON summary plus the heatmaps as a compressed .npz.
+"""
+import argparse
+import glob
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+HEATMAP_BINS = (32, 18)                    # Screen grid, x by y
+REACTION_BINS = np.arange(0, 5001, 100)    # Milliseconds a coin was on screen before the catch
+LATENCY_BINS = np.arange(0, 201, 2)        # Milliseconds per hand inference
+CURVE_BUCKET = 10                          # Seconds per difficulty curve point
+CURVE_BUCKETS = 60                         # Everything past 10 minutes lands in the last bucket
+
+
+def analyze_session(path):
+    """Reduce one session file to arrays that can be summed across sessions"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        meta = data['meta']
+        events = data['events']
+        kind = np.asarray(events['kind'])
+        t, x, y, speed, value = (np.asarray(events[name], dtype=np.float64)
+                                 for name in ('t', 'x', 'y', 'speed', 'value'))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Skipping {path}: {e}")
+        return None
+
+    catch = kind == 'catch'
+    miss = kind == 'miss'
+    tick = kind == 'tick'
+    detect = kind == 'detect'
+
+    # Positions normalized to the screen so sessions at any resolution line up
+    # (misses are logged just below the bottom edge, so clip into the last row)
+    nx = np.clip(x / meta['width'], 0, 0.999)
+    ny = np.clip(y / meta['height'], 0, 0.999)
+    grid = dict(bins=HEATMAP_BINS, range=[[0, 1], [0, 1]])
+    catch_heatmap = np.histogram2d(nx[catch], ny[catch], **grid)[0]
+    miss_heatmap = np.histogram2d(nx[miss], ny[miss], **grid)[0]
+
+    # Coins fall from just above the top edge. Speeds are logged in 1280-wide
+    # design pixels and moved round(speed * scale) output pixels per frame
+    # (sessions from before the scale was logged ran at 1280)
+    step = np.maximum(np.round(speed[catch] * meta.get('scale', 1.0)), 1)
+    frames_on_screen = (y[catch] + meta['coin_size'] / 2) / step
+    reaction_ms = frames_on_screen / meta['fps'] * 1000
+    reaction_hist = np.histogram(reaction_ms, bins=REACTION_BINS)[0]
+    latency_hist = np.histogram(value[detect], bins=LATENCY_BINS)[0]
+
+    bucket = np.minimum((t[tick] // CURVE_BUCKET).astype(np.int64), CURVE_BUCKETS - 1)
+    return {
+        'sessions': 1,
+        'catches': int(catch.sum()),
+        'misses': int(miss.sum()),
+        'bombs': int((kind == 'bomb').sum()),
+        'powerups': int((kind == 'powerup').sum()),
+        'catch_heatmap': catch_heatmap,
+        'miss_heatmap': miss_heatmap,
+        'reaction_hist': reaction_hist,
+        'latency_hist': latency_hist,
+        'curve_count': np.bincount(bucket, minlength=CURVE_BUCKETS),
+        'curve_speed': np.bincount(bucket, weights=speed[tick], minlength=CURVE_BUCKETS),
+        'curve_score': np.bincount(bucket, weights=value[tick], minlength=CURVE_BUCKETS),
+        'durations': [meta.get('duration', 0)],
+        'scores': list(meta.get('scores', [])),
+    }
+
+
+def merge(total, part):
+    """Add one session's aggregates into the running total"""
+    if total is None:
+        return part
+    for key, item in part.items():
+        total[key] = total[key] + item  # Sums arrays and counts, concatenates lists
+    return total
+
+
+def histogram_percentiles(counts, bins, percentiles):
+    """Percentiles from a histogram (upper bin edge of the bin that reaches them)"""
+    total = counts.sum()
+    if not total:
+        return {}
+    cumulative = np.cumsum(counts) / total
+    return {f'p{p}': float(bins[np.searchsorted(cumulative, p / 100) + 1]) for p in percentiles}
+
+
+def summarize(total, failed):
+    scores = np.asarray(total['scores'], dtype=np.float64)
+    durations = np.asarray(total['durations'], dtype=np.float64)
+    attempts = total['catches'] + total['misses']
+    counts = total['curve_count']
+    seen = counts > 0
+    return {
+        'sessions': total['sessions'],
+        'failed': failed,
+        'catches': total['catches'],
+        'misses': total['misses'],
+        'catch_rate': round(total['catches'] / attempts, 4) if attempts else None,
+        'bombs': total['bombs'],
+        'powerups': total['powerups'],
+        'score': {'mean': float(scores.mean()), 'p50': float(np.percentile(scores, 50)),
+                  'p90': float(np.percentile(scores, 90)), 'max': float(scores.max())}
+        if scores.size else {},
+        'duration_s': {'mean': float(durations.mean()), 'p50': float(np.percentile(durations, 50)),
+                       'p90': float(np.percentile(durations, 90))},
+        'reaction_ms': histogram_percentiles(total['reaction_hist'], REACTION_BINS, (10, 50, 90)),
+        'detection_latency_ms': histogram_percentiles(total['latency_hist'], LATENCY_BINS, (50, 95, 99)),
+        'difficulty_curve': [
+            {'t': int(i * CURVE_BUCKET), 'samples': int(counts[i]),
+             'speed': round(float(total['curve_speed'][i] / counts[i]), 2),
+             'score': round(float(total['curve_score'][i] / counts[i]), 2)}
+            for i in np.flatnonzero(seen)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate AR Coin Game session logs')
+    parser.add_argument('sessions', nargs='?', default='sessions', help='Directory of session_*.json files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--out', default='summary.json', help='Summary file (heatmaps go next to it)')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.sessions, 'session_*.json')))
+    if not paths:
+        print(f"No session logs in {args.sessions}")
+        return
+
+    total = None
+    failed = 0
+    chunksize = max(1, len(paths) // (args.workers * 4))
+    with Pool(args.workers) as pool:
+        for part in pool.imap_unordered(analyze_session, paths, chunksize=chunksize):
+            if part is None:
+                failed += 1
+            else:
+                total = merge(total, part)
+    if total is None:
+        print("No readable session logs")
+        return
+
+    summary = summarize(total, failed)
+    with open(args.out, 'w') as f:
+        json.dump(summary, f, indent=2)
+    heatmaps = os.path.splitext(args.out)[0] + '_heatmaps.npz'
+    np.savez_compressed(heatmaps, catch=total['catch_heatmap'], miss=total['miss_heatmap'])
+    print(f"Analyzed {summary['sessions']} sessions ({failed} skipped) -> {args.out}, {heatmaps}")
+
+
+if __name__ == '__main__':
+    main()
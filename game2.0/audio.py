@@ -0,0 +1,112 @@
+"""Low-latency sound effects with a fixed channel pool.
+
+The game thread only calls `play()`, which records the event for the current
+frame. `flush()` at the end of the frame hands the frame's events to a worker
+thread in one non-blocking put, so several catches in the same frame become a
+single play and the game loop never waits on the mixer. The worker assigns
+channels from a fixed pool honouring per-sound voice limits and priorities.
+"""
+import queue
+import threading
+import time
+
+import pygame
+
+# Per-sound voice limits and priorities (higher priority may steal channels)
+SOUND_CONFIG = {
+    'coin': {'voices': 3, 'priority': 1},
+    'combo': {'voices': 2, 'priority': 2},
+    'powerup': {'voices': 2, 'priority': 3},
+    'achievement': {'voices': 1, 'priority': 3},
+    'bomb': {'voices': 1, 'priority': 4},
+    'game_over': {'voices': 1, 'priority': 5},
+}
+DEFAULT_CONFIG = {'voices': 1, 'priority': 1}
+
+
+def init_mixer(frequency=44100, buffer=256, channels=12):
+    """Initialize the mixer with a small buffer (pygame's default adds latency)"""
+    pygame.mixer.pre_init(frequency=frequency, size=-16, channels=2, buffer=buffer)
+    pygame.mixer.init()
+    pygame.mixer.set_num_channels(channels)
+
+
+class SoundEngine:
+    """Queues sound events off the game thread and plays them on pooled channels"""
+
+    def __init__(self, num_channels=None):
+        self.sounds = {}
+        self.num_channels = num_channels or pygame.mixer.get_num_channels()
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        # channel index -> (sound name, priority, start time)
+        self.playing = {}
+        self.pending = set()
+        self.events = queue.Queue(maxsize=64)
+        self.dropped = 0
+        self.load_errors = 0
+        self.worker = threading.Thread(target=self._run, name='sound-engine', daemon=True)
+        self.worker.start()
+
+    def load(self, name, path):
+        try:
+            self.sounds[name] = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            self.load_errors += 1
+            print(f"Audio loading error: {e}")
+
+    def play(self, name):
+        """Request a sound for this frame; repeats within the frame coalesce"""
+        if name in self.sounds:
+            self.pending.add(name)
+
+    def flush(self):
+        """Hand this frame's events to the worker without blocking"""
+        if not self.pending:
+            return
+        try:
+            self.events.put_nowait(tuple(self.pending))
+        except queue.Full:
+            self.dropped += 1
+        self.pending.clear()
+
+    def stop(self):
+        self.pending.clear()
+        self.events.put(None)
+        self.worker.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            names = self.events.get()
+            if names is None:
+                break
+            # Highest priority first so it wins any channel contention
+            for name in sorted(names, key=lambda n: -SOUND_CONFIG.get(n, DEFAULT_CONFIG)['priority']):
+                self._start(name)
+
+    def _pick_channel(self, name, voices, priority):
+        for index in list(self.playing):
+            if not self.channels[index].get_busy():
+                del self.playing[index]
+
+        own = [index for index, (playing_name, _, _) in self.playing.items() if playing_name == name]
+        if len(own) >= voices:
+            # Voice limit reached: retrigger this sound's oldest voice
+            return min(own, key=lambda index: self.playing[index][2])
+
+        for index in range(self.num_channels):
+            if index not in self.playing:
+                return index
+
+        # Pool full: steal the oldest voice of the lowest priority, if not above ours
+        victim = min(self.playing, key=lambda index: (self.playing[index][1], self.playing[index][2]))
+        if self.playing[victim][1] <= priority:
+            return victim
+        return None
+
+    def _start(self, name):
+        config = SOUND_CONFIG.get(name, DEFAULT_CONFIG)
+        index = self._pick_channel(name, config['voices'], config['priority'])
+        if index is None:
+            return
+        self.channels[index].play(self.sounds[name])
+        self.playing[index] = (name, config['priority'], time.perf_counter())
@@ -0,0 +1,129 @@
+"""Camera setup: negotiate a capture mode close to what the game renders at.
+
+OpenCV cannot list the modes a camera supports, so `Camera` probes a short
+list of common resolutions in the preferred pixel formats and keeps the first
+one the driver actually accepts. When the camera delivers the game width
+directly, the only per-frame work left is the mirror; otherwise mirroring and
+scaling are fused into a single `warpAffine` pass into a reused buffer.
+
+The source can also be a video file path (for replays and soak runs), which
+skips negotiation and loops back to the start when it runs out.
+"""
+import cv2
+import numpy as np
+
+# Common UVC modes, probed closest-to-target first
+COMMON_MODES = [(1920, 1080), (1280, 720), (960, 540), (800, 600), (640, 480)]
+PREFERRED_FOURCCS = ('MJPG', 'YUYV')
+
+
+class FrameTransform:
+    """Mirror and scale raw camera frames to the output size in one pass.
+
+    The returned frame is a buffer that is reused on the next call.
+    """
+
+    def __init__(self, in_width, in_height, out_width, mirror=True):
+        self.in_size = (in_width, in_height)
+        self.mirror = mirror
+        scale = out_width / in_width
+        self.out_size = (out_width, int(in_height * scale))
+        self.scaled = self.out_size != self.in_size
+        self.matrix = None
+        if self.scaled:
+            if mirror:
+                self.matrix = np.float32([[-scale, 0, scale * (in_width - 1)], [0, scale, 0]])
+            else:
+                self.matrix = np.float32([[scale, 0, 0], [0, scale, 0]])
+        self.buffer = np.empty((self.out_size[1], self.out_size[0], 3), dtype=np.uint8)
+
+    def apply(self, raw):
+        if self.matrix is not None:
+            cv2.warpAffine(raw, self.matrix, self.out_size, dst=self.buffer, flags=cv2.INTER_LINEAR)
+        elif self.mirror:
+            cv2.flip(raw, 1, dst=self.buffer)
+        else:
+            return raw
+        return self.buffer
+
+
+class Camera:
+    """cv2.VideoCapture with mode negotiation and a fused mirror/scale step.
+
+    With target_width=None the driver's default mode is kept at its own size.
+    """
+
+    def __init__(self, index=0, target_width=1280, target_fps=30, mirror=True, loop=True):
+        self.index = index
+        self.is_file = isinstance(index, str)
+        self.loop = loop
+        self.target_width = target_width
+        self.target_fps = target_fps
+        self.mirror = mirror
+        self.cap = None
+        self.width = 0
+        self.height = 0
+        self.fourcc = None
+        self.transform = None
+
+    def candidate_modes(self):
+        """Exact target width first, then larger modes (downscale), then smaller"""
+        return sorted(COMMON_MODES, key=lambda mode: (mode[0] != self.target_width,
+                                                      mode[0] < self.target_width,
+                                                      abs(mode[0] - self.target_width)))
+
+    def negotiate(self):
+        """Ask the driver for the closest supported mode and keep the first accepted"""
+        for fourcc in PREFERRED_FOURCCS:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            for width, height in self.candidate_modes():
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                self.cap.set(cv2.CAP_PROP_FPS, self.target_fps)
+                actual = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                          int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                if actual == (width, height):
+                    self.fourcc = fourcc
+                    return True
+        return False
+
+    def open(self):
+        """Open and configure the camera. Returns False if no frame can be read"""
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            print(f"Could not open camera {self.index}")
+            return False
+        if not self.is_file and self.target_width and not self.negotiate():
+            print("Camera did not accept a preferred mode, using driver default")
+
+        # The driver may still report one size and deliver another
+        ret, frame = self.cap.read()
+        if not ret:
+            print(f"Could not read from camera {self.index}")
+            return False
+        self.height, self.width = frame.shape[:2]
+        self.transform = FrameTransform(self.width, self.height, self.target_width or self.width,
+                                        self.mirror)
+        if self.transform.scaled:
+            print(f"Camera delivers {self.width}x{self.height}, scaling to {self.output_size}")
+        return True
+
+    @property
+    def output_size(self):
+        return self.transform.out_size
+
+    def read(self):
+        """Return (ret, frame) already mirrored and at the output size"""
+        if self.transform is None:
+            return False, None
+        ret, raw = self.cap.read()
+        if not ret and self.is_file and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, raw = self.cap.read()
+        if not ret:
+            return False, None
+        return True, self.transform.apply(raw)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
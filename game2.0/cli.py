@@ -0,0 +1,12 @@
+"""Command-line helpers shared by the games, host.py and the leaderboard server.
+
+Standard library only, so `python leaderboard.py` runs on a machine without
+OpenCV, MediaPipe or pygame.
+"""
+import sys
+
+
+def arg_value(name, default=None):
+    """Value of a --name=value command-line option"""
+    prefix = f'--{name}='
+    return next((arg[len(prefix):] for arg in sys.argv if arg.startswith(prefix)), default)
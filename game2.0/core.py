@@ -0,0 +1,177 @@
+"""Shared game core: the per-frame work every game variant repeats.
+
+The classic game (game.py), game_2.0.py and the `c` prototype are rule sets
+on top of the same pipeline, so a speed-up made here applies to all of them:
+
+- `Stage`: negotiated camera capture at the game width, a display backend
+  and frame pacing.
+- `HandDetector`: a warmed-up MediaPipe model behind the motion gate, so
+  static frames reuse the last landmarks, and `draw_hand` for its results.
+- `spawn`, `touched` and `draw_sprites`: falling-object spawns, hand/object
+  hits in one vectorized pass and clipped premultiplied sprite blits.
+- `load_json` and `save_json`: persistence that reports errors instead of
+  raising, and `arg_value` (from cli.py) for --name=value options.
+"""
+import json
+import os
+import random
+import time
+
+import cv2
+
+from camera import Camera
+from cli import arg_value
+from display import create_display
+from motion import MotionGate
+from pacing import FramePacer
+from players import batch_touches
+from startup import warm_up_hands
+
+
+class Stage:
+    """Camera in, display out, paced to target_fps.
+
+    width=None keeps the camera's own resolution; mirror=False shows the raw image.
+    """
+
+    def __init__(self, title, source=0, width=1280, backend='opencv', fullscreen=False, vsync=True,
+                 target_fps=30, mirror=True):
+        self.camera = Camera(source, target_width=width, mirror=mirror)
+        self.display = create_display(backend, title, fullscreen=fullscreen, vsync=vsync)
+        self.pacer = FramePacer(target_fps=target_fps, display=self.display)
+
+    def open(self):
+        return self.camera.open()
+
+    @property
+    def size(self):
+        """(width, height) of the frames read() returns"""
+        return self.camera.output_size
+
+    def read(self):
+        """Return (ret, frame) at the game width"""
+        return self.camera.read()
+
+    def present(self, frame, target_fps=None):
+        """Show the frame, wait out the rest of the frame budget and return the key pressed"""
+        self.display.show(frame)
+        return self.pacer.wait(target_fps)
+
+    def close(self):
+        self.pacer.report()
+        self.camera.release()
+        self.display.close()
+
+
+class HandDetector:
+    """MediaPipe hands, skipped on frames the motion gate sees as unchanged.
+
+    `detect()` is the whole step. A game that checks the clean frame but
+    detects later (or not on every frame) calls `check()` itself, then
+    `commit()` and `process()`, or `skip()` to keep the previous result.
+    """
+
+    def __init__(self, max_hands=2, min_detection_confidence=0.5, motion_gating=True, on_latency=None):
+        import mediapipe as mp
+
+        self.hands = mp.solutions.hands.Hands(max_num_hands=max_hands,
+                                              min_detection_confidence=min_detection_confidence)
+        warm_up_hands(self.hands)
+        self.motion_gate = MotionGate(enabled=motion_gating)
+        self.on_latency = on_latency  # Called with each inference time in seconds
+        self.result = None
+
+    def detect(self, frame):
+        """Hand landmarks for a clean camera frame (call before drawing on it)"""
+        if self.check(frame) or self.result is None:
+            self.commit()
+            return self.process(frame)
+        self.skip()
+        return self.result
+
+    def check(self, frame):
+        """True if the frame changed enough since the last inference frame"""
+        return self.motion_gate.check(frame)
+
+    def commit(self):
+        """The checked frame goes to inference: compare later frames with it"""
+        self.motion_gate.commit()
+
+    def skip(self):
+        """The checked frame keeps the previous result"""
+        self.motion_gate.skip()
+
+    def process(self, frame):
+        """Run inference on the frame, without the motion check, and keep the result"""
+        started = time.perf_counter()
+        self.result = self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if self.on_latency is not None:
+            self.on_latency(time.perf_counter() - started)
+        return self.result
+
+    def draw(self, frame, result):
+        """Draw the landmarks and connections of every detected hand"""
+        for hand_landmarks in result.multi_hand_landmarks or []:
+            draw_hand(frame, hand_landmarks)
+
+    @property
+    def skip_rate(self):
+        return self.motion_gate.skip_rate
+
+    def close(self):
+        self.hands.close()
+
+
+def draw_hand(frame, hand_landmarks):
+    """Draw one hand's landmarks and connections (also for pipeline and pool results)"""
+    import mediapipe as mp
+
+    mp.solutions.drawing_utils.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+
+
+def fingertips(result, width, height, landmark=8):
+    """Pixel position of one landmark (default the index fingertip) on every hand"""
+    return [(int(hand.landmark[landmark].x * width), int(hand.landmark[landmark].y * height))
+            for hand in (result.multi_hand_landmarks or [])]
+
+
+def spawn(x1, x2, size, y=0):
+    """Top-left corner for a new object of the given size inside the x1..x2 strip"""
+    return (random.randint(x1, x2 - size), y)
+
+
+def touched(hands, objects, size):
+    """Per object, whether any hand is within its radius"""
+    return batch_touches(hands, [False] * len(hands), objects, [size] * len(objects),
+                         [-1] * len(objects), [0] * len(hands)).any(axis=0)
+
+
+def draw_sprites(frame, sprite, positions, size, fallback_color):
+    """Blit the sprite at every top-left position, or draw discs if it didn't load"""
+    for x, y in positions:
+        if sprite is not None:
+            sprite.blit(frame, x, y)
+        else:
+            cv2.circle(frame, (x + size // 2, y + size // 2), size // 2, fallback_color, -1)
+
+
+def load_json(path, default):
+    """Contents of a JSON file, or default if it is missing or unreadable"""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load {path}: {e}")
+    return default
+
+
+def save_json(path, data, indent=None):
+    """Write data as JSON. Returns False (after printing why) if it failed"""
+    try:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=indent)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Could not save {path}: {e}")
+        return False
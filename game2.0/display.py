@@ -0,0 +1,124 @@
+"""Display backends: where frames are presented and where key presses come from.
+
+- `OpenCVDisplay`: the original `cv2.imshow` window.
+- `SDLDisplay`: a pygame window. The BGR frame is wrapped in a surface that
+  points at the NumPy buffer (no conversion pass in Python), SDL scales it to
+  the window or fullscreen on the GPU (`pygame.SCALED`), and `flip()` waits
+  for vsync so large displays don't tear.
+- `HeadlessDisplay`: no window, no input.
+
+All of them have `show(frame)`, `poll_key(timeout_ms)` (returns a key code
+like `cv2.waitKey`, -1 if none) and `close()`; `FramePacer` does its waiting
+inside `poll_key`.
+"""
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+
+class OpenCVDisplay:
+    def __init__(self, title, fullscreen=False):
+        self.title = title
+        self.fullscreen = fullscreen
+        self.opened = False
+
+    def show(self, frame):
+        if not self.opened:
+            self.opened = True
+            if self.fullscreen:
+                cv2.namedWindow(self.title, cv2.WINDOW_NORMAL)
+                cv2.setWindowProperty(self.title, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+        cv2.imshow(self.title, frame)
+
+    def poll_key(self, timeout_ms=1):
+        return cv2.waitKey(max(1, timeout_ms))
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class SDLDisplay:
+    def __init__(self, title, fullscreen=False, vsync=True):
+        self.title = title
+        self.fullscreen = fullscreen
+        self.vsync = vsync
+        self.screen = None
+        self.size = None
+        self.bgr_surfaces = True  # pygame < 2.1.3 can't wrap BGR data
+        self.rgb = None
+
+    def _open(self, size):
+        pygame.display.init()
+        pygame.display.set_caption(self.title)
+        flags = pygame.SCALED | (pygame.FULLSCREEN if self.fullscreen else 0)
+        try:
+            self.screen = pygame.display.set_mode(size, flags, vsync=int(self.vsync))
+        except pygame.error as e:
+            print(f"Display: vsync unavailable ({e}), presenting without it")
+            self.vsync = False
+            self.screen = pygame.display.set_mode(size, flags)
+        self.size = size
+
+    def show(self, frame):
+        height, width = frame.shape[:2]
+        if self.size != (width, height):
+            self._open((width, height))
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        if self.bgr_surfaces:
+            try:
+                surface = pygame.image.frombuffer(frame, (width, height), 'BGR')
+            except ValueError:
+                self.bgr_surfaces = False
+        if not self.bgr_surfaces:
+            if self.rgb is None or self.rgb.shape != frame.shape:
+                self.rgb = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+            surface = pygame.image.frombuffer(self.rgb, (width, height), 'RGB')
+        self.screen.blit(surface, (0, 0))
+        pygame.display.flip()  # Blocks until vblank when vsync is on
+
+    def poll_key(self, timeout_ms=1):
+        """Wait up to timeout_ms for a key press; closing the window counts as Q"""
+        if self.screen is None:
+            time.sleep(timeout_ms / 1000)
+            return -1
+        deadline = time.perf_counter() + timeout_ms / 1000
+        while True:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            event = pygame.event.wait(max(1, remaining_ms))
+            if event.type == pygame.NOEVENT:
+                return -1
+            if event.type == pygame.QUIT:
+                return ord('q')
+            if event.type == pygame.KEYDOWN and event.key < 256:
+                return event.key
+            if remaining_ms <= 1:
+                return -1
+
+    def close(self):
+        if self.screen is not None:
+            pygame.display.quit()
+            self.screen = None
+
+
+class HeadlessDisplay:
+    def show(self, frame):
+        pass
+
+    def poll_key(self, timeout_ms=1):
+        return -1  # The pacer sleeps out the rest of the frame
+
+    def close(self):
+        pass
+
+
+def create_display(backend, title, fullscreen=False, vsync=True):
+    """Display for --display=opencv|sdl|none"""
+    if backend == 'none':
+        return HeadlessDisplay()
+    if backend == 'sdl':
+        return SDLDisplay(title, fullscreen=fullscreen, vsync=vsync)
+    return OpenCVDisplay(title, fullscreen=fullscreen)
@@ -1,17 +1,69 @@
 import cv2
 import numpy as np
 import random
-import mediapipe as mp
 import pygame
-import json
-import os
 import time
 import math
-from datetime import datetime
+import sys
 from collections import deque
 
-# Initialize pygame
-pygame.mixer.init()
+from audio import SoundEngine, init_mixer
+from camera import FrameTransform
+from core import HandDetector, Stage, arg_value, draw_hand, draw_sprites, fingertips, load_json, save_json, spawn
+from idle import IdleMonitor
+from inference_pool import StationClient
+from layout import Layout
+from leaderboard import Leaderboard, RemoteLeaderboard, daily_board, format_rank, submit_scores
+from metrics import Metrics, MetricsServer
+from motion import MotionGate
+from recorder import Recorder
+from pipeline import Pipeline
+from players import HandTracker, Player, batch_touches, split_regions
+from scheduler import Scheduler
+from session_log import SessionLog
+from soak import SoakMonitor
+from sprites import SpriteCache, render_powerup_sprite
+from startup import Startup
+
+# Command-line options
+WINDOW_NAME = 'Enhanced AR Coin Game'
+HEADLESS = '--headless' in sys.argv            # No window (soak runs, servers)
+DISPLAY_BACKEND = 'none' if HEADLESS else arg_value('display', 'opencv')  # opencv or sdl
+FULLSCREEN = '--fullscreen' in sys.argv
+SCREEN_WIDTH = int(arg_value('width', 1280))   # Output resolution; sprites and HUD scale to it
+VSYNC = '--no-vsync' not in sys.argv           # SDL backend only
+CAMERA_SOURCE = arg_value('source', '0')       # Camera index or a video file to replay
+CAMERA_SOURCE = int(CAMERA_SOURCE) if CAMERA_SOURCE.isdigit() else CAMERA_SOURCE
+SOAK_HOURS = float(arg_value('soak', 0))       # Track memory growth for this long, then exit
+GAME_DATA_FILE = 'soak_game_data.json' if SOAK_HOURS else 'game_data.json'
+LEADERBOARD_FILE = 'soak_leaderboard.jsonl' if SOAK_HOURS else 'leaderboard.jsonl'
+LEADERBOARD_URL = arg_value('leaderboard')     # Shared leaderboard server (leaderboard.py)
+NUM_PLAYERS = max(1, min(4, int(arg_value('players', 1))))  # Split-screen players
+GAME_MODE = 'solo' if NUM_PLAYERS == 1 else f'{NUM_PLAYERS}-player'  # Leaderboard mode board
+STATION = arg_value('station')                 # Set by host.py: station number on a shared machine
+if STATION is not None:
+    STATION = int(STATION)
+    WINDOW_NAME += f' - Station {STATION + 1}'
+    GAME_DATA_FILE = GAME_DATA_FILE.replace('.json', f'_station{STATION}.json')
+    LEADERBOARD_FILE = LEADERBOARD_FILE.replace('.json', f'_station{STATION}.json')
+
+# Stations started by host.py send frames to its shared inference pool
+station = None
+if arg_value('inference') is not None:
+    station = StationClient(arg_value('inference'))
+
+# Optional multi-process pipeline (--pipeline). The workers are forked before
+# the mixer, camera and MediaPipe are set up so the children start clean.
+pipeline = None
+if '--pipeline' in sys.argv and station is None:
+    pipeline = Pipeline(camera_index=CAMERA_SOURCE, target_width=SCREEN_WIDTH, min_detection_confidence=0.7,
+                        motion_gating='--no-motion-gate' not in sys.argv,
+                        max_hands=max(2, NUM_PLAYERS))
+    if not pipeline.start():
+        pipeline = None
+
+# Initialize pygame (small mixer buffer for low-latency effects)
+init_mixer()
 
 # --- Game Classes ---
 class Particle:
@@ -35,16 +87,16 @@ class Particle:
         cv2.circle(frame, (int(self.x), int(self.y)), 3, color, -1)
 
 class PowerUp:
-    def __init__(self, x, y, power_type):
+    def __init__(self, x, y, power_type, size):
         self.x = x
         self.y = y
         self.type = power_type
-        self.size = 50
+        self.size = size
         self.duration = 300  # frames
         
-    def update(self, fall_speed):
+    def update(self, fall_speed, screen_height):
         self.y += fall_speed
-        return self.y < 800  # Return False if off screen
+        return self.y < screen_height  # Return False if off screen
 
 class GameStats:
     def __init__(self):
@@ -57,29 +109,37 @@ class GameStats:
 
 # --- Load Assets ---
 def load_audio():
-    sounds = {}
+    audio = SoundEngine()
     try:
         pygame.mixer.music.load('background.wav')
         pygame.mixer.music.play(-1)
-        sounds['coin'] = pygame.mixer.Sound('coin_sound.wav')
-        sounds['game_over'] = pygame.mixer.Sound('game-over.wav')
-        sounds['bomb'] = pygame.mixer.Sound('bomb_explosion.wav')
-        sounds['powerup'] = pygame.mixer.Sound('powerup.wav')
-        sounds['combo'] = pygame.mixer.Sound('combo.wav')
-        sounds['achievement'] = pygame.mixer.Sound('achievement.wav')
     except pygame.error as e:
         print(f"Audio loading error: {e}")
-    return sounds
+    audio.load('coin', 'coin_sound.wav')
+    audio.load('game_over', 'game-over.wav')
+    audio.load('bomb', 'bomb_explosion.wav')
+    audio.load('powerup', 'powerup.wav')
+    audio.load('combo', 'combo.wav')
+    audio.load('achievement', 'achievement.wav')
+    return audio
+
+def load_images():
+    """Coin and bomb sprites at the output scale, None for any that can't be read"""
+    return (sprite_cache.load('coin.png', (coin_size, coin_size)),
+            sprite_cache.load('bomb.png', (bomb_size, bomb_size)))
+
+def open_camera():
+    """The stage's camera once it delivers frames, or None"""
+    return stage.camera if stage.open() else None
+
+def create_hand_model():
+    """Import MediaPipe, build the gated hand detector and pay its initialization up front"""
+    return HandDetector(max_hands=max(2, NUM_PLAYERS), min_detection_confidence=0.7,
+                        motion_gating=MOTION_GATING, on_latency=record_detection_latency)
 
 def load_game_data():
     """Load persistent game data"""
-    try:
-        if os.path.exists("game_data.json"):
-            with open("game_data.json", 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {
+    return load_json(GAME_DATA_FILE, {
         'high_score': 0,
         'stats': {
             'games_played': 0,
@@ -90,62 +150,67 @@ def load_game_data():
             'achievements': []
         },
         'leaderboard': []
-    }
+    })
 
 def save_game_data(data):
     """Save persistent game data"""
-    try:
-        with open("game_data.json", 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        print(f"Could not save game data: {e}")
+    started = time.perf_counter()
+    if not save_json(GAME_DATA_FILE, data, indent=2):
+        metrics.errors.inc('save')
+    metrics.save_latency.observe(time.perf_counter() - started)
 
 # --- Initialize Game ---
-sounds = load_audio()
+metrics = Metrics()
 game_data = load_game_data()
+if LEADERBOARD_URL:
+    leaderboard = RemoteLeaderboard(LEADERBOARD_URL)
+else:
+    leaderboard = Leaderboard(LEADERBOARD_FILE)
+    if not len(leaderboard) and game_data['leaderboard']:
+        leaderboard.restore(game_data['leaderboard'], mode='solo')  # Top 10 from before the boards
 
-# Initialize video capture
-cap = cv2.VideoCapture(0)
-
-# Initialize mediapipe
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7)
-mp_draw = mp.solutions.drawing_utils
-
-# Game settings
-coin_size = 60
-bomb_size = 70
-powerup_size = 50
+# Game settings (object sizes are design pixels at 1280 wide, scaled to the output)
+desired_screen_width = SCREEN_WIDTH
+ui = Layout(desired_screen_width)
+sprite_cache = SpriteCache()
+coin_size = ui.size(60)
+bomb_size = ui.size(70)
+powerup_size = ui.size(50)
 initial_fall_speed = 3
 fall_speed = initial_fall_speed
-score = 0
-num_coins = 5
-missed_coins = 0
+num_coins = 5  # Per player
 max_missed_coins = 5
 game_over = False
-desired_screen_width = 1280
+IDLE_AFTER_SECONDS = 30  # No hands (or parked on game over) for this long -> attract mode
+if SOAK_HOURS:
+    IDLE_AFTER_SECONDS = float('inf')  # Keep the game loop busy for the whole soak
+MOTION_GATING = '--no-motion-gate' not in sys.argv  # Skip inference on static frames
+TARGET_FPS = 30
+METRICS_PORT = 9108 + (STATION or 0)  # One port per station on a shared machine
 
-# Game state variables
-combo_count = 0
-max_combo = 0
+# Game state variables (score, combo and power-ups live on each Player)
 game_start_time = time.time()
 particles = []
 powerups = []
-active_powerups = {}
-hand_trails = {}  # Dictionary to store trails for each hand
+players = []
+hand_tracker = HandTracker(max_distance=ui.size(200))
+hand_trails = {}  # Trail per tracked hand id
 MAX_TRAIL_LENGTH = 20
-screen_shake = 0
 bombs_avoided = 0
-coins_caught_this_game = 0
 
 # Power-up effects
 POWERUP_TYPES = {
-    'speed': {'color': (0, 255, 255), 'duration': 300},  # Cyan - slow motion
-    'magnet': {'color': (255, 0, 255), 'duration': 200}, # Magenta - attract coins
-    'shield': {'color': (0, 255, 0), 'duration': 150},   # Green - bomb protection
-    'double': {'color': (255, 255, 0), 'duration': 250}  # Yellow - double points
+    'speed': {'color': (0, 255, 255), 'duration': 300, 'label': 'S'},   # Cyan - slow motion
+    'magnet': {'color': (255, 0, 255), 'duration': 200, 'label': 'M'},  # Magenta - attract coins
+    'shield': {'color': (0, 255, 0), 'duration': 150, 'label': 'S'},    # Green - bomb protection
+    'double': {'color': (255, 255, 0), 'duration': 250, 'label': '2X'}  # Yellow - double points
 }
 
+# Pulsing power-up icons, pre-rendered once per type
+powerup_sprites = {power_type: render_powerup_sprite(info['color'], info['label'], powerup_size,
+                                                         pulse=ui.size(20))
+                   for power_type, info in POWERUP_TYPES.items()}
+
 # Achievement definitions
 ACHIEVEMENTS = {
     'first_coin': {'name': 'First Blood', 'desc': 'Catch your first coin'},
@@ -158,34 +223,31 @@ ACHIEVEMENTS = {
     'powerup_collector': {'name': 'Power Hunter', 'desc': 'Collect 10 power-ups'}
 }
 
-def check_achievements(score, combo, bombs_avoided, game_time, powerups_collected):
+def check_achievements(player, bombs_avoided, game_time):
     """Check and award achievements"""
     new_achievements = []
     current_achievements = set(game_data['stats']['achievements'])
     
-    if coins_caught_this_game >= 1 and 'first_coin' not in current_achievements:
+    if player.coins_caught >= 1 and 'first_coin' not in current_achievements:
         new_achievements.append('first_coin')
-    if fall_speed >= 13 and 'speed_demon' not in current_achievements:  # Speed 10+ 
+    if player.fall_speed >= 13 and 'speed_demon' not in current_achievements:  # Speed 10+ 
         new_achievements.append('speed_demon')
     if bombs_avoided >= 50 and 'bomb_dodger' not in current_achievements:
         new_achievements.append('bomb_dodger')
-    if missed_coins == 0 and score > 0 and 'perfectionist' not in current_achievements:
+    if player.missed == 0 and player.score > 0 and 'perfectionist' not in current_achievements:
         new_achievements.append('perfectionist')
-    if combo >= 10 and 'combo_master' not in current_achievements:
+    if player.combo >= 10 and 'combo_master' not in current_achievements:
         new_achievements.append('combo_master')
-    if score >= 100 and 'centurion' not in current_achievements:
+    if player.score >= 100 and 'centurion' not in current_achievements:
         new_achievements.append('centurion')
     if game_time >= 120 and 'survivor' not in current_achievements:
         new_achievements.append('survivor')
-    if powerups_collected >= 10 and 'powerup_collector' not in current_achievements:
+    if player.powerups_collected >= 10 and 'powerup_collector' not in current_achievements:
         new_achievements.append('powerup_collector')
     
     for achievement in new_achievements:
         game_data['stats']['achievements'].append(achievement)
-        try:
-            sounds['achievement'].play()
-        except:
-            pass
+        audio.play('achievement')
     
     return new_achievements
 
@@ -195,32 +257,33 @@ def create_particles(x, y, color, count=10):
         velocity = (random.randint(-5, 5), random.randint(-8, -2))
         particles.append(Particle(x, y, color, velocity))
 
-def create_coin(screen_width):
-    x = random.randint(0, screen_width - coin_size)
-    y = random.randint(-100, -coin_size)
-    return (x, y)
+def create_coin(region):
+    """New coin above the given (x1, x2) strip of the screen"""
+    return spawn(region[0], region[1], coin_size, random.randint(-ui.px(100), -coin_size))
 
 def create_bomb(screen_width):
-    x = random.randint(0, screen_width - bomb_size)
-    y = random.randint(-100, -bomb_size)
-    return (x, y)
+    return spawn(0, screen_width, bomb_size, random.randint(-ui.px(100), -bomb_size))
 
 def create_powerup(screen_width):
-    x = random.randint(0, screen_width - powerup_size)
-    y = random.randint(-100, -powerup_size)
+    x, y = spawn(0, screen_width, powerup_size, random.randint(-ui.px(100), -powerup_size))
     power_type = random.choice(list(POWERUP_TYPES.keys()))
-    return PowerUp(x, y, power_type)
+    return PowerUp(x, y, power_type, powerup_size)
 
-def check_touch(obj, hand_position, obj_size):
-    obj_x, obj_y = obj
-    hand_x, hand_y = hand_position
-    distance = np.sqrt((obj_x + obj_size // 2 - hand_x)**2 + (obj_y + obj_size // 2 - hand_y)**2)
-    
-    # Magnet effect
-    if 'magnet' in active_powerups:
-        return distance < obj_size * 1.5
-    
-    return distance < obj_size // 2
+def player_fall_speed(player):
+    """Fall speed for a player's coins: score, combo bonus and slow motion"""
+    base_speed = initial_fall_speed + (player.score // 7)
+
+    # High combo speed boost
+    if player.combo >= 15:
+        base_speed += 5  # Extreme speed at 15+ combo
+    elif player.combo >= 10:
+        base_speed += 3  # High speed at 10+ combo
+    elif player.combo >= 5:
+        base_speed += 1  # Moderate speed at 5+ combo
+
+    if 'speed' in player.active_powerups:
+        return max(1, base_speed // 3)  # Slow motion
+    return base_speed
 
 def detect_gesture(hand_landmarks):
     """Detect hand gestures for special actions"""
@@ -256,143 +319,185 @@ def detect_gesture(hand_landmarks):
 
 def draw_powerup(frame, powerup):
     """Draw power-up with animated effects"""
-    color = POWERUP_TYPES[powerup.type]['color']
-    
-    # Pulsing effect
-    pulse = int(20 * math.sin(time.time() * 5))
-    size = powerup.size + pulse
-    
-    # Draw power-up
-    cv2.circle(frame, (int(powerup.x + powerup.size//2), int(powerup.y + powerup.size//2)), 
-               size//2, color, -1)
-    cv2.circle(frame, (int(powerup.x + powerup.size//2), int(powerup.y + powerup.size//2)), 
-               size//2, (255, 255, 255), 2)
-    
-    # Draw power-up symbol
     center_x, center_y = int(powerup.x + powerup.size//2), int(powerup.y + powerup.size//2)
-    if powerup.type == 'speed':
-        cv2.putText(frame, 'S', (center_x-8, center_y+8), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
-    elif powerup.type == 'magnet':
-        cv2.putText(frame, 'M', (center_x-8, center_y+8), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
-    elif powerup.type == 'shield':
-        cv2.putText(frame, 'S', (center_x-8, center_y+8), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
-    elif powerup.type == 'double':
-        cv2.putText(frame, '2X', (center_x-12, center_y+8), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-
-def draw_ui(frame, score, high_score, combo, fall_speed, missed_coins, max_missed_coins, fps):
+    powerup_sprites[powerup.type].draw(frame, center_x, center_y, time.time())
+
+def draw_ui(frame, player, high_score, max_missed_coins, fps, skip_rate=0.0):
     """Draw game UI with enhanced information"""
+    score, combo, fall_speed = player.score, player.combo, player.fall_speed
     # Score panel background
-    cv2.rectangle(frame, (5, 5), (300, 120), (0, 0, 0), -1)
-    cv2.rectangle(frame, (5, 5), (300, 120), (255, 255, 255), 2)
+    ui.box(frame, ui.point(0, 0, 5, 5), ui.point(0, 0, 300, 120), (0, 0, 0), -1)
+    ui.box(frame, ui.point(0, 0, 5, 5), ui.point(0, 0, 300, 120), (255, 255, 255), 2)
     
     # Main stats
-    cv2.putText(frame, f'Score: {score}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-    cv2.putText(frame, f'High: {high_score}', (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-    cv2.putText(frame, f'Combo: {combo}', (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-    cv2.putText(frame, f'Speed: {fall_speed}', (10, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
+    ui.text(frame, f'Score: {score}', ui.point(0, 0, 10, 30), 0.8, (255, 255, 255), 2)
+    ui.text(frame, f'High: {high_score}', ui.point(0, 0, 10, 55), 0.6, (255, 255, 0), 2)
+    ui.text(frame, f'Combo: {combo}', ui.point(0, 0, 10, 80), 0.6, (0, 255, 0), 2)
+    ui.text(frame, f'Speed: {fall_speed}', ui.point(0, 0, 10, 105), 0.6, (255, 0, 255), 2)
     
     # Right side info
-    cv2.rectangle(frame, (frame.shape[1]-200, 5), (frame.shape[1]-5, 120), (0, 0, 0), -1)
-    cv2.rectangle(frame, (frame.shape[1]-200, 5), (frame.shape[1]-5, 120), (255, 255, 255), 2)
+    ui.box(frame, ui.point(1, 0, -200, 5), ui.point(1, 0, -5, 120), (0, 0, 0), -1)
+    ui.box(frame, ui.point(1, 0, -200, 5), ui.point(1, 0, -5, 120), (255, 255, 255), 2)
     
-    cv2.putText(frame, f'Missed: {missed_coins}/{max_missed_coins}', (frame.shape[1]-195, 30), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
-    cv2.putText(frame, f'FPS: {fps}', (frame.shape[1]-195, 55), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    ui.text(frame, f'Missed: {player.missed}/{max_missed_coins}', ui.point(1, 0, -195, 30),
+            0.6, (255, 165, 0), 2)
+    ui.text(frame, f'FPS: {fps}  Skip: {int(skip_rate * 100)}%', ui.point(1, 0, -195, 55),
+            0.6, (255, 255, 255), 2)
     # NEW: Add combo speed indicator
     if combo >= 10:
-        cv2.putText(frame, 'HIGH COMBO SPEED!', (10, 130), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+        ui.text(frame, 'HIGH COMBO SPEED!', ui.point(0, 0, 10, 130), 0.6, (255, 0, 0), 2)
     elif combo >= 5:
-        cv2.putText(frame, 'Combo Speed+', (10, 130), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 165, 0), 2)
+        ui.text(frame, 'Combo Speed+', ui.point(0, 0, 10, 130), 0.5, (255, 165, 0), 2)
     # Active power-ups
     y_offset = 80
-    for powerup_type, remaining in active_powerups.items():
+    for powerup_type in player.active_powerups:
+        remaining = scheduler.remaining(('powerup', player.index, powerup_type))
         color = POWERUP_TYPES[powerup_type]['color']
-        cv2.putText(frame, f'{powerup_type.upper()}: {remaining//60}s', 
-                   (frame.shape[1]-195, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        ui.text(frame, f'{powerup_type.upper()}: {remaining // TARGET_FPS}s', ui.point(1, 0, -195, y_offset),
+                0.5, color, 2)
         y_offset += 20
 
-def draw_game_over_screen(frame, final_score, high_score, is_new_high_score, game_time, new_achievements):
+def draw_player_panels(frame, players, max_missed_coins, fps):
+    """Split-screen HUD: region dividers and a compact panel per player"""
+    for player in players:
+        x1, x2 = player.region
+        nx1, nx2 = x1 / ui.width, x2 / ui.width  # Player strip in screen units
+        if x1 > 0:
+            cv2.line(frame, (x1, 0), (x1, ui.height), (255, 255, 255), ui.size(2))
+        ui.box(frame, ui.point(nx1, 0, 5, 5), ui.point(nx1, 0, 200, 80), (0, 0, 0), -1)
+        ui.box(frame, ui.point(nx1, 0, 5, 5), ui.point(nx1, 0, 200, 80), player.color, 2)
+        ui.text(frame, f'{player.name}  Score: {player.score}', ui.point(nx1, 0, 10, 28),
+                0.6, (255, 255, 255), 2)
+        ui.text(frame, f'Combo: {player.combo}  Missed: {player.missed}/{max_missed_coins}',
+                ui.point(nx1, 0, 10, 50), 0.45, (0, 255, 0), 1)
+        labels = ' '.join(POWERUP_TYPES[powerup_type]['label'] for powerup_type in player.active_powerups)
+        ui.text(frame, labels, ui.point(nx1, 0, 10, 72), 0.5, (0, 255, 255), 2)
+        if player.out:
+            ui.text(frame, 'OUT', ui.point((nx1 + nx2) / 2, 0.5, -40, 0), 1.5, (0, 0, 255), 3)
+    ui.text(frame, f'FPS: {fps}', ui.point(1, 1, -100, -15), 0.6, (255, 255, 255), 2)
+
+def draw_game_over_screen(frame, player, high_score, is_new_high_score, game_time, new_achievements,
+                          ranks=None):
     """Enhanced game over screen"""
-    frame_height, frame_width = frame.shape[:2]
+    final_score = player.score
     
     # Semi-transparent overlay
     overlay = frame.copy()
-    cv2.rectangle(overlay, (0, 0), (frame_width, frame_height), (0, 0, 0), -1)
+    cv2.rectangle(overlay, (0, 0), (ui.width, ui.height), (0, 0, 0), -1)
     cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
     
     # Game Over title with glow effect
     for offset in range(3, 0, -1):
-        cv2.putText(frame, 'GAME OVER', (frame_width // 2 - 150 + offset, frame_height // 2 - 100 + offset), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 2, (50, 50, 50), 3)
-    cv2.putText(frame, 'GAME OVER', (frame_width // 2 - 150, frame_height // 2 - 100), 
-                cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+        ui.text(frame, 'GAME OVER', ui.point(0.5, 0.5, -150 + offset, -100 + offset), 2, (50, 50, 50), 3)
+    ui.text(frame, 'GAME OVER', ui.point(0.5, 0.5, -150, -100), 2, (0, 0, 255), 3)
     
-    # Score information
-    y_pos = frame_height // 2 - 40
-    cv2.putText(frame, f'Final Score: {final_score}', (frame_width // 2 - 120, y_pos), 
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    # Score information (y_pos in design pixels from the screen center)
+    y_pos = -40
+    ui.text(frame, f'Final Score: {final_score}', ui.point(0.5, 0.5, -120, y_pos), 1, (255, 255, 255), 2)
     
     y_pos += 40
     if is_new_high_score:
         # Flashing new high score
         flash_color = (0, 255, 0) if int(time.time() * 3) % 2 else (255, 255, 255)
-        cv2.putText(frame, 'NEW HIGH SCORE!', (frame_width // 2 - 140, y_pos), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, flash_color, 2)
+        ui.text(frame, 'NEW HIGH SCORE!', ui.point(0.5, 0.5, -140, y_pos), 1, flash_color, 2)
     else:
-        cv2.putText(frame, f'High Score: {high_score}', (frame_width // 2 - 110, y_pos), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
+        ui.text(frame, f'High Score: {high_score}', ui.point(0.5, 0.5, -110, y_pos), 1, (255, 255, 0), 2)
     
     # Game statistics
     y_pos += 60
-    cv2.putText(frame, f'Max Combo: {max_combo}', (frame_width // 2 - 100, y_pos), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+    ui.text(frame, f'Max Combo: {player.max_combo}', ui.point(0.5, 0.5, -100, y_pos), 0.8, (0, 255, 255), 2)
     
     y_pos += 30
-    cv2.putText(frame, f'Time: {int(game_time)}s', (frame_width // 2 - 70, y_pos), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    ui.text(frame, f'Time: {int(game_time)}s', ui.point(0.5, 0.5, -70, y_pos), 0.8, (255, 255, 255), 2)
     
     y_pos += 30
-    cv2.putText(frame, f'Coins Caught: {coins_caught_this_game}', (frame_width // 2 - 110, y_pos), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 215, 0), 2)
+    ui.text(frame, f'Coins Caught: {player.coins_caught}', ui.point(0.5, 0.5, -110, y_pos),
+            0.8, (255, 215, 0), 2)
+
+    # Leaderboard position
+    if ranks:
+        y_pos += 30
+        ui.text(frame, f'You ranked {format_rank(ranks)} (today {format_rank(ranks, daily_board())})',
+                ui.point(0.5, 0.5, -210, y_pos), 0.8, (0, 255, 255), 2)
     
     # New achievements
     if new_achievements:
         y_pos += 50
-        cv2.putText(frame, 'NEW ACHIEVEMENTS:', (frame_width // 2 - 130, y_pos), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        ui.text(frame, 'NEW ACHIEVEMENTS:', ui.point(0.5, 0.5, -130, y_pos), 0.7, (0, 255, 0), 2)
         for i, achievement in enumerate(new_achievements[:3]):  # Show max 3
             y_pos += 25
             achievement_name = ACHIEVEMENTS[achievement]['name']
-            cv2.putText(frame, f'• {achievement_name}', (frame_width // 2 - 100, y_pos), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            ui.text(frame, f'• {achievement_name}', ui.point(0.5, 0.5, -100, y_pos), 0.6, (255, 255, 255), 2)
     
     # Controls
-    cv2.putText(frame, 'Press R to Restart | Q to Quit', (frame_width // 2 - 160, frame_height - 50), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    ui.text(frame, 'Press R to Restart | Q to Quit', ui.point(0.5, 1, -160, -50), 0.8, (255, 255, 255), 2)
 
-def update_powerups():
-    """Update active power-up timers"""
-    global active_powerups
-    expired_powerups = []
-    
-    for powerup_type in list(active_powerups.keys()):
-        active_powerups[powerup_type] -= 1
-        if active_powerups[powerup_type] <= 0:
-            expired_powerups.append(powerup_type)
-    
-    for powerup_type in expired_powerups:
-        del active_powerups[powerup_type]
+def draw_multiplayer_results(frame, players, high_score, is_new_high_score, game_time, player_ranks):
+    """Split-screen game over: players ranked by score"""
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, 0), (ui.width, ui.height), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
+
+    ui.text(frame, 'GAME OVER', ui.point(0.5, 0.5, -150, -160), 2, (0, 0, 255), 3)
+    y_pos = -90
+    for rank, player in enumerate(sorted(players, key=lambda p: p.score, reverse=True), 1):
+        ranked = format_rank(player_ranks.get(player.index))
+        ui.text(frame, f'{rank}. {player.name}  {player.score} pts  combo {player.max_combo}  {ranked}',
+                ui.point(0.5, 0.5, -250, y_pos), 0.9, player.color, 2)
+        y_pos += 40
+
+    y_pos += 20
+    if is_new_high_score:
+        ui.text(frame, 'NEW HIGH SCORE!', ui.point(0.5, 0.5, -140, y_pos), 1, (0, 255, 0), 2)
+    else:
+        ui.text(frame, f'High Score: {high_score}', ui.point(0.5, 0.5, -110, y_pos), 1, (255, 255, 0), 2)
+    ui.text(frame, f'Time: {int(game_time)}s', ui.point(0.5, 0.5, -70, y_pos + 40), 0.8, (255, 255, 255), 2)
+    ui.text(frame, 'Press R to Restart | Q to Quit', ui.point(0.5, 1, -160, -50), 0.8, (255, 255, 255), 2)
+
+def activate_powerup(player, powerup_type, duration):
+    """Start (or restart) a power-up; the scheduler removes it when it expires"""
+    player.active_powerups[powerup_type] = scheduler.now + duration
+    scheduler.schedule(duration, lambda: player.active_powerups.pop(powerup_type, None),
+                       key=('powerup', player.index, powerup_type))
+
+def deactivate_powerup(player, powerup_type):
+    player.active_powerups.pop(powerup_type, None)
+    scheduler.cancel(('powerup', player.index, powerup_type))
+
+def reset_players():
+    for player in players:
+        player.reset()
+        player.coins = [create_coin(player.region) for _ in range(num_coins)]
+
+def spawn_bomb():
+    """Spawn a bomb every 3 seconds, max 3 (retry next frame while full)"""
+    if len(bombs) < 3:
+        bombs.append(create_bomb(screen_width))
+        scheduler.schedule(BOMB_SPAWN_DELAY, spawn_bomb, key='bomb_spawn')
+    else:
+        scheduler.schedule(1, spawn_bomb, key='bomb_spawn')
+
+def spawn_powerup():
+    """Spawn a power-up, then wait 5 seconds plus a 30%-per-frame chance"""
+    powerups.append(create_powerup(screen_width))
+    schedule_powerup_spawn()
+
+def schedule_powerup_spawn():
+    # Frames until the 30% roll succeeds are geometric, so draw them in one go
+    extra_frames = int(math.log(1.0 - random.random()) / math.log(0.7))
+    scheduler.schedule(POWERUP_SPAWN_DELAY + extra_frames, spawn_powerup, key='powerup_spawn')
+
+def schedule_spawns():
+    scheduler.schedule(BOMB_SPAWN_DELAY, spawn_bomb, key='bomb_spawn')
+    schedule_powerup_spawn()
 
 def draw_hand_trail(frame):
     """Draw separate glowing trails for each hand"""
-    for hand_id, trail in hand_trails.items():
+    for track_id, trail in hand_trails.items():
         if len(trail) > 1:
             # Create a unique color for each hand
             colors = [(0, 255, 255), (255, 0, 255), (0, 255, 0), (255, 255, 0)]  # Cyan, Magenta, Green, Yellow
-            trail_color = colors[hand_id % len(colors)]
+            trail_color = colors[track_id % len(colors)]
             
             for i in range(len(trail) - 1):
                 if i < len(trail) - 1:
@@ -403,7 +508,7 @@ def draw_hand_trail(frame):
 
 def apply_screen_shake(frame):
     """Apply screen shake effect"""
-    global screen_shake
+    screen_shake = ui.px(scheduler.remaining('shake'))  # Shake amplitude decays with time left
     if screen_shake > 0:
         shake_x = random.randint(-screen_shake, screen_shake)
         shake_y = random.randint(-screen_shake, screen_shake)
@@ -412,149 +517,228 @@ def apply_screen_shake(frame):
         rows, cols = frame.shape[:2]
         M = np.float32([[1, 0, shake_x], [0, 1, shake_y]])
         frame = cv2.warpAffine(frame, M, (cols, rows))
-        screen_shake -= 1
     
     return frame
 
+def record_detection_latency(latency):
+    metrics.detection_latency.observe(latency)
+    session_log.record('detect', time.time() - game_start_time, value=round(latency * 1000, 2))
+
+def detect_hands(frame, moved=True):
+    """Run hand detection in-process or fetch the pipeline's (or host pool's) latest result.
+
+    When the motion gate saw no movement the previous result is reused. Only
+    frames that actually go to inference become the gate's new reference.
+    """
+    if station is not None:
+        if not moved:
+            motion_gate.skip()
+        elif station.submit(frame):  # Refused while the pool still has the previous frame
+            motion_gate.commit()
+        latency = station.take_detection_latency()
+        if latency is not None:
+            record_detection_latency(latency)
+        return station.hand_results()
+    if pipeline is not None:
+        latency = pipeline.take_detection_latency()
+        if latency is not None:
+            record_detection_latency(latency)
+        return pipeline.hand_results()
+    if moved or detector.result is None:
+        detector.commit()
+        return detector.process(frame)
+    detector.skip()
+    return detector.result
+
+def start_session_log():
+    """Start logging the next game with the settings analytics needs"""
+    session_log.start(width=screen_width, height=screen_height, fps=TARGET_FPS,
+                      players=NUM_PLAYERS, coin_size=coin_size, initial_fall_speed=initial_fall_speed,
+                      bomb_spawn_delay=BOMB_SPAWN_DELAY, powerup_spawn_delay=POWERUP_SPAWN_DELAY,
+                      scale=ui.scale)  # Logged speeds are design px/frame; coins move speed * scale
+
+def keep_top_scores():
+    """Keep a copy of the all-time top 10 in game_data"""
+    game_data['leaderboard'] = leaderboard.top() or game_data['leaderboard']
+
+def detection_skip_rate():
+    return pipeline.skip_rate if pipeline is not None else motion_gate.skip_rate
+
 # Initialize game variables
 screen_width = None
 screen_height = None
-coins = None
 bombs = []
-bomb_spawn_timer = 0
-powerup_spawn_timer = 0
+scheduler = Scheduler()
+idle = IdleMonitor(idle_after=IDLE_AFTER_SECONDS)
+# Camera (opened at startup unless the pipeline owns it), display and pacing
+stage = Stage(WINDOW_NAME, source=CAMERA_SOURCE, width=desired_screen_width, backend=DISPLAY_BACKEND,
+              fullscreen=FULLSCREEN, vsync=VSYNC, target_fps=TARGET_FPS)
+detector = None  # In-process HandDetector, built at startup
+motion_gate = MotionGate(enabled=MOTION_GATING)  # The detector's own gate once it exists
+recorder = Recorder(fps=TARGET_FPS)
+session_log = SessionLog(enabled='--log-sessions' in sys.argv)  # Event logs for analytics.py
+game_recorded = False
+final_game_time = 0
+is_new_high_score = False
+player_ranks = {}  # Player index -> leaderboard ranks of the last game
+
+# Optional localhost metrics endpoint (--metrics)
+metrics.gauge('ar_detection_skip_ratio', 'Share of frames that skipped hand inference',
+              detection_skip_rate)
+metrics.gauge('ar_fps', 'Presented frames per second', lambda: stage.pacer.fps)
+metrics.gauge('ar_missed_frame_deadlines', 'Frames that overran the pacing budget',
+              lambda: stage.pacer.missed)
+# Soak mode (--soak=HOURS): sample memory and the structures that can grow
+soak = None
+if SOAK_HOURS:
+    soak = SoakMonitor(SOAK_HOURS * 3600, {
+        'hand_trails': lambda: sum(len(trail) for trail in hand_trails.values()),
+        'hand_tracks': lambda: len(hand_tracker.tracks),
+        'particles': lambda: len(particles),
+        'powerups': lambda: len(powerups),
+        'bombs': lambda: len(bombs),
+        'leaderboard': lambda: len(game_data['leaderboard']),
+        'achievements': lambda: len(game_data['stats']['achievements']),
+        'timers': lambda: len(scheduler),
+        # Every score stays in the boards' sorted lists (local boards only)
+        'leaderboard_scores': lambda: len(leaderboard) if not LEADERBOARD_URL else 0,
+    })
+    soak.start()
+
+metrics_server = None
+if '--metrics' in sys.argv:
+    metrics_server = MetricsServer(metrics, port=METRICS_PORT)
+    if not metrics_server.start():
+        metrics_server = None
+BOMB_SPAWN_DELAY = 181
+POWERUP_SPAWN_DELAY = 301
 last_frame_time = time.time()
 fps = 0
-powerups_collected = 0
 new_achievements_this_game = []
 
-# Load images with error handling
-coin_image = None
-bomb_image = None
+# Load audio, images, camera and hand model in parallel behind a loading screen
+# (capture and the model are owned by the workers in pipeline mode, and
+# stations started by host.py use the host's inference pool)
+startup = Startup(stage.display, size=(ui.width, ui.height))
+startup.submit('audio', load_audio)
+startup.submit('images', load_images)
+if pipeline is None:
+    startup.submit('camera', open_camera, required=True)
+    if station is None:
+        startup.submit('model', create_hand_model, required=True)
+startup.show_loading()
+loaded = startup.wait()
+startup.report()
+if startup.missing:
+    print(f"Error: could not start the {' and '.join(startup.missing)}, exiting")
+    stage.camera.release()
+    if station is not None:
+        station.close()
+    stage.display.close()
+    sys.exit(1)
 
-try:
-    coin_image = cv2.imread('coin.png', cv2.IMREAD_UNCHANGED)
-    if coin_image is not None:
-        coin_image = cv2.resize(coin_image, (coin_size, coin_size))
-    bomb_image = cv2.imread('bomb.png', cv2.IMREAD_UNCHANGED)
-    if bomb_image is not None:
-        bomb_image = cv2.resize(bomb_image, (bomb_size, bomb_size))
-except Exception as e:
-    print(f"Error loading images: {e}")
+audio = loaded['audio'] or SoundEngine()
+coin_sprite, bomb_sprite = loaded['images'] or (None, None)
+if audio.load_errors:
+    metrics.errors.inc('audio', audio.load_errors)
+if coin_sprite is None or bomb_sprite is None:
+    metrics.errors.inc('images')
+if pipeline is None:
+    detector = loaded.get('model')
+    if detector is not None:
+        motion_gate = detector.motion_gate
+else:
+    frame_transform = FrameTransform(*pipeline.frame_size, desired_screen_width)
 
 # Main game loop
 while True:
     frame_start_time = time.time()
-    ret, frame = cap.read()
+    # Frames arrive mirrored and at the game width (camera.py)
+    if pipeline is not None:
+        ret, frame = pipeline.read()
+        if ret:
+            frame = frame_transform.apply(frame)
+    else:
+        ret, frame = stage.read()
     if not ret:
         break
-    
-    frame = cv2.flip(frame, 1)
     frame_height, frame_width = frame.shape[:2]
 
     # Initialize game objects
     if screen_width is None:
-        resize_factor = desired_screen_width / frame_width
-        resized_frame_height = int(frame_height * resize_factor)
-        screen_width = desired_screen_width
-        screen_height = resized_frame_height
-        coins = [create_coin(screen_width) for _ in range(num_coins)]
-
-    # Resize frame
-    frame = cv2.resize(frame, (desired_screen_width, int(frame_height * desired_screen_width / frame_width)))
-
-    if not game_over:
-        # Calculate dynamic fall speed WITH COMBO BONUS
-        base_speed = initial_fall_speed + (score // 7)
-
-        # High combo speed boost - NEW CODE
-        combo_speed_bonus = 0
-        if combo_count >= 15:
-            combo_speed_bonus = 5  # Extreme speed at 15+ combo
-        elif combo_count >= 10:
-            combo_speed_bonus = 3  # High speed at 10+ combo
-        elif combo_count >= 5:
-            combo_speed_bonus = 1  # Moderate speed at 5+ combo
-
-        # Apply combo speed bonus
-        base_speed += combo_speed_bonus
-
-        # Apply power-up effects
-        current_fall_speed = base_speed
-        if 'speed' in active_powerups:
-            current_fall_speed = max(1, base_speed // 3)  # Slow motion
-
-        fall_speed = current_fall_speed
+        screen_width = frame_width
+        screen_height = frame_height
+        ui.fit(screen_width, screen_height)
+        players = [Player(i, region) for i, region in enumerate(split_regions(screen_width, NUM_PLAYERS))]
+        reset_players()
+        schedule_spawns()
+        start_session_log()
 
-        
-        # Update power-ups
-        update_powerups()
-        
-        # Spawn power-ups randomly
-        powerup_spawn_timer += 1
-        if powerup_spawn_timer > 300 and random.random() < 0.3:  # 30% chance every 5 seconds
-            powerups.append(create_powerup(screen_width))
-            powerup_spawn_timer = 0
-
-        # Update and draw coins
-        for i, (coin_x, coin_y) in enumerate(coins):
-            # Draw coin (use circle if image not available)
-            if coin_image is not None and (coin_y >= 0 and coin_y + coin_size <= frame.shape[0] and 
-                                          coin_x >= 0 and coin_x + coin_size <= frame.shape[1]):
-                try:
-                    alpha_coin = coin_image[:, :, 3] / 255.0
-                    alpha_frame = 1.0 - alpha_coin
-                    for c in range(0, 3):
-                        frame[coin_y:coin_y + coin_size, coin_x:coin_x + coin_size, c] = (
-                            alpha_coin * coin_image[:, :, c] +
-                            alpha_frame * frame[coin_y:coin_y + coin_size, coin_x:coin_x + coin_size, c])
-                except:
-                    pass
-            else:
-                # Fallback: draw circle
-                cv2.circle(frame, (coin_x + coin_size//2, coin_y + coin_size//2), 
-                          coin_size//2, (0, 215, 255), -1)
-            
-            coins[i] = (coin_x, coin_y + fall_speed)
-            
-            if coin_y > frame.shape[0]:
-                coins[i] = create_coin(screen_width)
-                missed_coins += 1
-                combo_count = 0  # Reset combo on miss
-                if missed_coins >= max_missed_coins:
-                    game_over = True
-                    final_score = score
-                    game_time = time.time() - game_start_time
+    # Compare the clean camera frame (before anything is drawn) with the last
+    # frame that went through inference; detect_hands() commits or skips it
+    moved = pipeline is not None or motion_gate.check(frame)
 
-        # Update and draw bombs
-        bomb_spawn_timer += 1
-        if bomb_spawn_timer > 180 and len(bombs) < 3:  # Spawn bomb every 3 seconds, max 3
-            bombs.append(create_bomb(screen_width))
-            bomb_spawn_timer = 0
+    # Attract mode: low frame rate, occasional detection, cheap screen
+    now = time.time()
+    idle.tick(game_over, now)
+    attract = False
+    if idle.idle:
+        if pipeline is not None:
+            pipeline.set_detection_interval(idle.detect_interval)
+        if idle.should_detect(now):
+            idle_time = idle.mark_detection(bool(detect_hands(frame, moved).multi_hand_landmarks), now)
+            if not game_over:
+                game_start_time += idle_time  # The game was paused, not played
+        attract = idle.idle
+        if not attract and pipeline is not None:
+            pipeline.set_detection_interval(0)
+
+    if attract:
+        # The game stays paused; keys are still handled below
+        idle.draw_attract(frame, game_data['high_score'])
+    elif not game_over:
+        current_game_time = time.time() - game_start_time
+
+        # Per-player fall speed; shared bombs and power-ups follow the fastest player
+        active_players = [player for player in players if not player.out]
+        for player in active_players:
+            player.fall_speed = player_fall_speed(player)
+        fall_speed = max(player.fall_speed for player in active_players)
+        if scheduler.now % TARGET_FPS == 0:
+            # Difficulty curve sample, once a second of play
+            for player in active_players:
+                session_log.record('tick', current_game_time, player.index,
+                                   speed=player.fall_speed, value=player.score)
 
+        # Fire due timers: power-up expiry, bomb and power-up spawns, shake
+        scheduler.advance()
+
+        # Update and draw each player's coins
+        for player in active_players:
+            coins = player.coins
+            step = ui.size(player.fall_speed)  # Fall speed is in design pixels per frame
+            draw_sprites(frame, coin_sprite, coins, coin_size, (0, 215, 255))
+            for i, (coin_x, coin_y) in enumerate(coins):
+                coins[i] = (coin_x, coin_y + step)
+
+                if coin_y > frame.shape[0]:
+                    session_log.record('miss', current_game_time, player.index, coin_x + coin_size//2,
+                                       coin_y, player.fall_speed, player.missed + 1)
+                    coins[i] = create_coin(player.region)
+                    player.missed += 1
+                    player.combo = 0  # Reset combo on miss
+                    if player.missed >= max_missed_coins:
+                        player.out = True
+
+        # Update and draw bombs
         # Update bombs (iterate backwards to safely remove items)
+        step = ui.size(fall_speed)
+        draw_sprites(frame, bomb_sprite, bombs, bomb_size, (0, 0, 255))
         for i in range(len(bombs) - 1, -1, -1):
             bomb_x, bomb_y = bombs[i]
             
-            # Draw bomb
-            if bomb_image is not None and (bomb_y >= 0 and bomb_y + bomb_size <= frame.shape[0] and 
-                                          bomb_x >= 0 and bomb_x + bomb_size <= frame.shape[1]):
-                try:
-                    alpha_bomb = bomb_image[:, :, 3] / 255.0
-                    alpha_frame = 1.0 - alpha_bomb
-                    for c in range(0, 3):
-                        frame[bomb_y:bomb_y + bomb_size, bomb_x:bomb_x + bomb_size, c] = (
-                            alpha_bomb * bomb_image[:, :, c] +
-                            alpha_frame * frame[bomb_y:bomb_y + bomb_size, bomb_x:bomb_x + bomb_size, c])
-                except:
-                    pass
-            else:
-                # Fallback: draw circle
-                cv2.circle(frame, (bomb_x + bomb_size//2, bomb_y + bomb_size//2), 
-                          bomb_size//2, (0, 0, 255), -1)
-            
             # Update bomb position
-            new_bomb_y = bomb_y + fall_speed
+            new_bomb_y = bomb_y + step
             
             if new_bomb_y > frame.shape[0]:
                 # Remove bomb if it goes off screen
@@ -567,138 +751,142 @@ while True:
         # Update and draw power-ups (iterate backwards to safely remove items)
         for i in range(len(powerups) - 1, -1, -1):
             powerup = powerups[i]
-            if powerup.update(fall_speed):
+            if powerup.update(step, screen_height):
                 draw_powerup(frame, powerup)
             else:
                 powerups.pop(i)
 
-        # Hand detection
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result_hands = hands.process(rgb_frame)
+        # Hand detection; tracked ids keep trails and players attached to the same hand
+        result_hands = detect_hands(frame, moved)
+        idle.mark_detection(bool(result_hands.multi_hand_landmarks), time.time())
+        hand_landmarks_list = result_hands.multi_hand_landmarks or []
+        hand_positions = fingertips(result_hands, frame_width, frame_height)
+        track_ids = hand_tracker.update(hand_positions)
+        hand_players = [hand_tracker.player_for(track_id, players) for track_id in track_ids]
 
         gesture_detected = 'normal'
-        if result_hands.multi_hand_landmarks:
-            for hand_id, hand_landmarks in enumerate(result_hands.multi_hand_landmarks):
-                # Detect gestures
-                gesture_detected = detect_gesture(hand_landmarks)
-                
-                # Handle special gestures
-                if gesture_detected == 'peace' and 'shield' not in active_powerups:
-                    active_powerups['shield'] = 300
-                    try:
-                        sounds['powerup'].play()
-                    except:
-                        pass
-                elif gesture_detected == 'fist':
-                    # Destroy all bombs
-                    if bombs:
-                        bombs.clear()
-                        bombs_avoided += len(bombs)
-                        create_particles(frame_width//2, frame_height//2, (255, 0, 0), 20)
-                elif gesture_detected == 'thumbs_up' and 'speed' not in active_powerups:
-                    active_powerups['speed'] = 200
-                    try:
-                        sounds['powerup'].play()
-                    except:
-                        pass
-
-                # Get hand position
-                index_finger_tip = hand_landmarks.landmark[8]
-                hand_x = int(index_finger_tip.x * desired_screen_width)
-                hand_y = int(index_finger_tip.y * frame.shape[0])
-                hand_position = (hand_x, hand_y)
-                
-                # Add to specific hand trail
-                if hand_id not in hand_trails:
-                    hand_trails[hand_id] = deque(maxlen=MAX_TRAIL_LENGTH)
-                hand_trails[hand_id].append(hand_position)
-                
-                # Draw hand indicator with unique color per hand
-                hand_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0), (255, 255, 0)]  # Red, Blue, Green, Yellow
-                hand_color = hand_colors[hand_id % len(hand_colors)]
-                
-                cv2.circle(frame, hand_position, 8, hand_color, -1)
-                cv2.circle(frame, hand_position, 12, (255, 255, 255), 2)
-                
-                # Check coin collisions
-                for i, coin_position in enumerate(coins):
-                    if check_touch(coin_position, hand_position, coin_size):
-                        # Score calculation
-                        points = 1
-                        if 'double' in active_powerups:
-                            points *= 2
-                        
-                        score += points
-                        combo_count += 1
-                        max_combo = max(max_combo, combo_count)
-                        coins_caught_this_game += 1
-                        
-                        # Particle effects - CORRECTED VERSION
-                        create_particles(coin_position[0] + coin_size//2,
-                                    coin_position[1] + coin_size//2, (255, 215, 0))
-                        
-                        # Sound effects
-                        try:
-                            if combo_count >= 10:
-                                sounds['combo'].play()
-                            else:
-                                sounds['coin'].play()
-                        except:
-                            pass
-                        
-                        coins[i] = create_coin(screen_width)
-
-
-
-                # Check power-up collisions (iterate backwards to safely remove items)
-                for i in range(len(powerups) - 1, -1, -1):
-                    powerup = powerups[i]
-                    if check_touch((powerup.x, powerup.y), hand_position, powerup.size):
-                        active_powerups[powerup.type] = POWERUP_TYPES[powerup.type]['duration']
-                        powerups_collected += 1
-                        create_particles(powerup.x + powerup.size//2, powerup.y + powerup.size//2, 
-                                       POWERUP_TYPES[powerup.type]['color'])
-                        try:
-                            sounds['powerup'].play()
-                        except:
-                            pass
-                        powerups.pop(i)
-
-                # Check bomb collisions (iterate backwards to safely remove items)
-                # Check bomb collisions (iterate backwards to safely remove items)
-                for i in range(len(bombs) - 1, -1, -1):
-                    bomb_position = bombs[i]
-                    if check_touch(bomb_position, hand_position, bomb_size):
-                        if 'shield' in active_powerups:
-                            # Shield protects from bomb
-                            del active_powerups['shield']
-                            bombs.pop(i)
-                            create_particles(bomb_position[0] + bomb_size//2, 
-                                        bomb_position[1] + bomb_size//2, (0, 255, 0))
-                        else:
-                            # Game over from bomb
-                            game_over = True
-                            final_score = score
-                            game_time = time.time() - game_start_time
-                            screen_shake = 20
-                            create_particles(bomb_position[0] + bomb_size//2, 
-                                        bomb_position[1] + bomb_size//2, (255, 0, 0), 30)
-                            try:
-                                sounds['bomb'].play()
-                            except:
-                                pass
-
-                        break  # Exit loop after collision
-
-                # Draw hand landmarks
-                mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-        else:
-            # Gradually fade out trails when no hands are detected
-            for hand_id in list(hand_trails.keys()):
-                if len(hand_trails[hand_id]) > 0:
-                    hand_trails[hand_id].popleft()  # Remove oldest point
-                if len(hand_trails[hand_id]) == 0:
-                    del hand_trails[hand_id]  # Remove empty trails
+        for hand_landmarks, hand_position, track_id, player in zip(
+                hand_landmarks_list, hand_positions, track_ids, hand_players):
+            if player.out:
+                continue
+
+            # Detect gestures
+            gesture_detected = detect_gesture(hand_landmarks)
+
+            # Handle special gestures
+            if gesture_detected == 'peace' and 'shield' not in player.active_powerups:
+                activate_powerup(player, 'shield', 300)
+                audio.play('powerup')
+            elif gesture_detected == 'fist':
+                # Destroy all bombs
+                if bombs:
+                    bombs.clear()
+                    bombs_avoided += len(bombs)
+                    create_particles(frame_width//2, frame_height//2, (255, 0, 0), 20)
+            elif gesture_detected == 'thumbs_up' and 'speed' not in player.active_powerups:
+                activate_powerup(player, 'speed', 200)
+                audio.play('powerup')
+
+            # Add to this hand's trail
+            if track_id not in hand_trails:
+                hand_trails[track_id] = deque(maxlen=MAX_TRAIL_LENGTH)
+            hand_trails[track_id].append(hand_position)
+
+            # Draw hand indicator: player color in split-screen, else a color per hand
+            hand_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0), (255, 255, 0)]  # Red, Blue, Green, Yellow
+            hand_color = player.color if NUM_PLAYERS > 1 else hand_colors[track_id % len(hand_colors)]
+
+            cv2.circle(frame, hand_position, ui.size(8), hand_color, -1)
+            cv2.circle(frame, hand_position, ui.size(12), (255, 255, 255), ui.size(2))
+
+            # Draw hand landmarks
+            draw_hand(frame, hand_landmarks)
+
+        # Gradually fade out trails of hands that aren't visible this frame
+        for track_id in list(hand_trails.keys()):
+            if track_id not in track_ids:
+                if len(hand_trails[track_id]) > 0:
+                    hand_trails[track_id].popleft()  # Remove oldest point
+                if len(hand_trails[track_id]) == 0:
+                    del hand_trails[track_id]  # Remove empty trails
+
+        # Collisions: every live hand against every coin, power-up and bomb in one pass.
+        # Coins can only be caught by the player they fall for.
+        live_hands = [(position, player) for position, player in zip(hand_positions, hand_players)
+                      if not player.out]
+        coin_refs = [(player, i) for player in active_players for i in range(len(player.coins))]
+        objects = ([player.coins[i] for player, i in coin_refs] +
+                   [(powerup.x, powerup.y) for powerup in powerups] + bombs)
+        touches = batch_touches(
+            [position for position, _ in live_hands],
+            ['magnet' in player.active_powerups for _, player in live_hands],
+            objects,
+            [coin_size] * len(coin_refs) + [powerup.size for powerup in powerups] + [bomb_size] * len(bombs),
+            [player.index for player, _ in coin_refs] + [-1] * (len(powerups) + len(bombs)),
+            [player.index for _, player in live_hands])
+        touched = touches.any(axis=0)
+        catcher = touches.argmax(axis=0)
+
+        # Coins
+        for k, (player, i) in enumerate(coin_refs):
+            if not touched[k]:
+                continue
+            coin_position = player.coins[i]
+            points = 2 if 'double' in player.active_powerups else 1
+            player.score += points
+            player.combo += 1
+            player.max_combo = max(player.max_combo, player.combo)
+            player.coins_caught += 1
+            session_log.record('catch', current_game_time, player.index, coin_position[0] + coin_size//2,
+                               coin_position[1] + coin_size//2, player.fall_speed, player.combo)
+            create_particles(coin_position[0] + coin_size//2,
+                             coin_position[1] + coin_size//2, (255, 215, 0))
+            audio.play('combo' if player.combo >= 10 else 'coin')
+            player.coins[i] = create_coin(player.region)
+
+        # Power-ups go to whichever player's hand reached them
+        powerup_start = len(coin_refs)
+        for i in range(len(powerups) - 1, -1, -1):
+            if not touched[powerup_start + i]:
+                continue
+            powerup = powerups.pop(i)
+            player = live_hands[catcher[powerup_start + i]][1]
+            activate_powerup(player, powerup.type, POWERUP_TYPES[powerup.type]['duration'])
+            player.powerups_collected += 1
+            session_log.record('powerup', current_game_time, player.index, powerup.x, powerup.y, fall_speed)
+            create_particles(powerup.x + powerup.size//2, powerup.y + powerup.size//2, 
+                             POWERUP_TYPES[powerup.type]['color'])
+            audio.play('powerup')
+
+        # Bombs: each hand sets off at most one
+        bomb_start = len(objects) - len(bombs)
+        exploded = set()
+        for h, (_, player) in enumerate(live_hands):
+            hits = [b for b in np.flatnonzero(touches[h, bomb_start:]) if b not in exploded]
+            if not hits or player.out:
+                continue
+            bomb_position = bombs[hits[-1]]
+            shielded = 'shield' in player.active_powerups
+            session_log.record('bomb', current_game_time, player.index, bomb_position[0] + bomb_size//2,
+                               bomb_position[1] + bomb_size//2, fall_speed, int(shielded))
+            if shielded:
+                # Shield protects from bomb
+                deactivate_powerup(player, 'shield')
+                exploded.add(hits[-1])
+                create_particles(bomb_position[0] + bomb_size//2, 
+                                 bomb_position[1] + bomb_size//2, (0, 255, 0))
+            else:
+                # Player knocked out by the bomb
+                player.out = True
+                scheduler.schedule(20, key='shake')
+                create_particles(bomb_position[0] + bomb_size//2, 
+                                 bomb_position[1] + bomb_size//2, (255, 0, 0), 30)
+                audio.play('bomb')
+        for b in sorted(exploded, reverse=True):
+            bombs.pop(b)
+
+        # The game ends once every player is out
+        game_over = all(player.out for player in players)
 
         # Update particles
         particles = [p for p in particles if p.update()]
@@ -709,9 +897,9 @@ while True:
         draw_hand_trail(frame)
 
         # Check achievements
-        current_game_time = time.time() - game_start_time
-        new_achievements_this_game = check_achievements(score, combo_count, bombs_avoided, 
-                                                       current_game_time, powerups_collected)
+        new_achievements_this_game = [achievement for player in active_players
+                                      for achievement in check_achievements(player, bombs_avoided,
+                                                                            current_game_time)]
 
         # Calculate FPS
         current_time = time.time()
@@ -719,76 +907,106 @@ while True:
         last_frame_time = current_time
 
         # Draw UI
-        draw_ui(frame, score, game_data['high_score'], combo_count, fall_speed, 
-                missed_coins, max_missed_coins, fps)
+        if NUM_PLAYERS == 1:
+            draw_ui(frame, players[0], game_data['high_score'], max_missed_coins, fps,
+                    detection_skip_rate())
+        else:
+            draw_player_panels(frame, players, max_missed_coins, fps)
         
         # Apply screen shake
         frame = apply_screen_shake(frame)
 
     else:
-        # Game over logic
-        is_new_high_score = score > game_data['high_score']
-        if is_new_high_score:
-            game_data['high_score'] = score
-        
-        # Update statistics
-        game_data['stats']['games_played'] += 1
-        game_data['stats']['total_coins_caught'] += coins_caught_this_game
-        game_data['stats']['total_bombs_avoided'] += bombs_avoided
-        game_data['stats']['total_time_played'] += int(time.time() - game_start_time)
-        if max_combo > game_data['stats']['best_combo']:
-            game_data['stats']['best_combo'] = max_combo
-        
-        # Add to leaderboard
-        leaderboard_entry = {
-            'score': score,
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-            'combo': max_combo,
-            'time': int(time.time() - game_start_time)
-        }
-        game_data['leaderboard'].append(leaderboard_entry)
-        game_data['leaderboard'] = sorted(game_data['leaderboard'], 
-                                        key=lambda x: x['score'], reverse=True)[:10]
-        
-        # Save game data
-        save_game_data(game_data)
+        # Game over logic (record the finished game once)
+        if not game_recorded:
+            game_recorded = True
+            final_game_time = time.time() - game_start_time
+            best_score = max(player.score for player in players)
+            is_new_high_score = best_score > game_data['high_score']
+            if is_new_high_score:
+                game_data['high_score'] = best_score
+
+            # Update statistics
+            game_data['stats']['games_played'] += 1
+            game_data['stats']['total_coins_caught'] += sum(player.coins_caught for player in players)
+            game_data['stats']['total_bombs_avoided'] += bombs_avoided
+            game_data['stats']['total_time_played'] += int(final_game_time)
+            best_combo = max(player.max_combo for player in players)
+            if best_combo > game_data['stats']['best_combo']:
+                game_data['stats']['best_combo'] = best_combo
+
+            # Add every player to the leaderboards (in the background for a remote
+            # server); a fresh dict per game keeps late replies off the next game
+            player_ranks = {}
+            submit_scores(leaderboard, {player.index: (player.score, {'combo': player.max_combo,
+                                                                      'time': int(final_game_time)})
+                                        for player in players},
+                          GAME_MODE, player_ranks, on_done=keep_top_scores)
+
+            # Save game data
+            save_game_data(game_data)
+            session_log.finish(duration=round(final_game_time, 2),
+                               scores=[player.score for player in players])
+            metrics.games_played.inc()
         
         # Draw game over screen
-        draw_game_over_screen(frame, score, game_data['high_score'], is_new_high_score, 
-                            time.time() - game_start_time, new_achievements_this_game)
+        if NUM_PLAYERS == 1:
+            draw_game_over_screen(frame, players[0], game_data['high_score'], is_new_high_score, 
+                                final_game_time, new_achievements_this_game, player_ranks.get(0))
+        else:
+            draw_multiplayer_results(frame, players, game_data['high_score'], is_new_high_score,
+                                     final_game_time, player_ranks)
+
+    # Start this frame's sounds
+    audio.flush()
 
-    # Show frame
-    cv2.imshow('Enhanced AR Coin Game', frame)
+    # Record the composited frame, then mark it on screen only
+    if not attract:
+        recorder.submit(frame)
+    recorder.draw_indicator(frame)
 
-    # Handle input
-    key = cv2.waitKey(1) & 0xFF
+    # Show frame and handle input while waiting out the rest of the frame budget
+    key = stage.present(frame, idle.idle_fps if attract else None)
+    if attract:
+        if key != 255:  # Any key press ends attract mode
+            idle_time = idle.wake(time.time())
+            if not game_over:
+                game_start_time += idle_time
+            if pipeline is not None:
+                pipeline.set_detection_interval(0)
+    elif stage.pacer.frame_times:
+        metrics.frame_time.observe(stage.pacer.frame_times[-1])
+    if soak is not None:
+        soak.tick()
+        if soak.finished:
+            break
+        if game_over and game_recorded:
+            key = ord('r')  # Keep playing back-to-back games
     if key == ord('q'):
         break
+    elif key == ord('v'):
+        # Toggle gameplay recording
+        recorder.toggle((frame.shape[1], frame.shape[0]))
     elif key == ord('r') and game_over:
         # Reset game
-        score = 0
-        missed_coins = 0
-        combo_count = 0
-        max_combo = 0
         game_over = False
+        game_recorded = False
         fall_speed = initial_fall_speed
-        coins_caught_this_game = 0
         bombs_avoided = 0
-        powerups_collected = 0
         game_start_time = time.time()
-        screen_shake = 0
         
-        # Reset game objects
-        coins = [create_coin(screen_width) for _ in range(num_coins)]
+        # Reset players and game objects
+        reset_players()
         bombs.clear()
         powerups.clear()
-        active_powerups.clear()
+        scheduler.clear()
+        schedule_spawns()
         particles.clear()
         hand_trails.clear()  # Clear all hand trails
+        hand_tracker.reset()
         new_achievements_this_game.clear()
-        
-        bomb_spawn_timer = 0
-        powerup_spawn_timer = 0
+        player_ranks = {}
+        start_session_log()
     elif key == ord('a') and game_over:
         # Show achievements screen (optional feature)
         print("\n=== ACHIEVEMENTS ===")
@@ -797,13 +1015,25 @@ while True:
             print(f"{status} {data['name']}: {data['desc']}")
         print("==================\n")
     # NEW: Warning effect when approaching high combo (add this before cv2.imshow)
-    if combo_count == 9:  # About to hit 10
+    if any(player.combo == 9 for player in players):  # About to hit 10
         # Flash the screen border - FIXED VERSION
-        cv2.rectangle(frame, (0, 0), (frame.shape[1], frame.shape[0]), (255, 255, 0), 5)
+        cv2.rectangle(frame, (0, 0), (frame.shape[1], frame.shape[0]), (255, 255, 0), ui.size(5))
 
 # Cleanup
-cap.release()
-cv2.destroyAllWindows()
+if metrics_server is not None:
+    metrics_server.stop()
+recorder.close()
+audio.stop()
+if pipeline is not None:
+    pipeline.stop()
+if detector is not None:
+    detector.close()
+if station is not None:
+    station.close()
+stage.close()
 
 # Final save
-save_game_data(game_data)
\ No newline at end of file
+save_game_data(game_data)
+
+if soak is not None and not soak.report():
+    sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Run several game stations on one machine with a shared inference pool.
+
+    python host.py --sources=0,1,2 --workers=2
+    python host.py --sources=clip1.mp4,clip2.mp4 --headless   # no cameras needed
+
+Each source gets its own game process (capture, game loop and window) that
+sends frames to one pool of MediaPipe workers instead of loading its own
+model. Any other options (--players=2, --metrics, --log-sessions, ...) are
+passed on to every station. Per-station inference rate and latency are
+printed every REPORT_INTERVAL seconds. Unless --leaderboard=URL points
+elsewhere, the host also serves one leaderboard that all stations share.
+"""
+import os
+import subprocess
+import sys
+import time
+
+from cli import arg_value
+from inference_pool import InferencePool
+from leaderboard import Leaderboard, LeaderboardServer
+
+REPORT_INTERVAL = 10
+LEADERBOARD_PORT = 9110
+
+
+def main():
+    sources = arg_value('sources', '0').split(',')
+    workers = int(arg_value('workers', max(1, min(len(sources), (os.cpu_count() or 2) // 2))))
+    players = int(arg_value('players', 1))
+    passthrough = [arg for arg in sys.argv[1:] if not arg.startswith(('--sources=', '--workers='))]
+
+    game_dir = os.path.dirname(os.path.abspath(__file__))
+    leaderboard_server = None
+    if arg_value('leaderboard') is None:
+        leaderboard_server = LeaderboardServer(Leaderboard(os.path.join(game_dir, 'leaderboard.jsonl')),
+                                               port=LEADERBOARD_PORT)
+        if leaderboard_server.start():
+            passthrough.append(f'--leaderboard=http://127.0.0.1:{LEADERBOARD_PORT}')
+
+    pool = InferencePool(len(sources), workers=workers, max_hands=max(2, players))
+    pool.start()
+
+    stations = [
+        subprocess.Popen([sys.executable, 'game_2.0.py', f'--source={source}', f'--station={i}',
+                          f'--inference={name}'] + passthrough, cwd=game_dir)
+        for i, (source, name) in enumerate(zip(sources, pool.names))]
+
+    next_report = time.time() + REPORT_INTERVAL
+    try:
+        while any(station.poll() is None for station in stations):
+            if not pool.healthy():
+                print("Inference pool worker died, stopping stations")
+                break
+            if time.time() >= next_report:
+                pool.report()
+                next_report += REPORT_INTERVAL
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for station in stations:
+            if station.poll() is None:
+                station.terminate()
+        for station in stations:
+            station.wait()
+        pool.report()
+        pool.stop()
+        if leaderboard_server is not None:
+            leaderboard_server.stop()
+
+
+if __name__ == '__main__':
+    main()
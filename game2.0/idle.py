@@ -0,0 +1,77 @@
+"""Idle / attract mode for unattended kiosks.
+
+When nobody has been seen for a while (or the game has been sitting on the
+game over screen), the game drops to a low frame rate, only runs hand
+detection every so often and shows a cheap attract screen. The first
+detection that finds a hand, or any key press, brings it straight back to
+full speed.
+"""
+import math
+import time
+
+from layout import Layout
+
+
+class IdleMonitor:
+    ACTIVE = 'active'
+    IDLE = 'idle'
+
+    def __init__(self, idle_after=30.0, idle_fps=5, detect_interval=0.5):
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.detect_interval = detect_interval
+        now = time.time()
+        self.state = self.ACTIVE
+        self.last_hand_time = now
+        self.last_detect_time = now
+        self.game_over_since = None
+        self.idle_since = None
+
+    @property
+    def idle(self):
+        return self.state == self.IDLE
+
+    def tick(self, game_over, now):
+        """Go idle after `idle_after` seconds without hands or on the game over screen"""
+        if not game_over:
+            self.game_over_since = None
+        elif self.game_over_since is None:
+            self.game_over_since = now
+
+        if self.state == self.ACTIVE:
+            no_hands = now - self.last_hand_time >= self.idle_after
+            parked = self.game_over_since is not None and now - self.game_over_since >= self.idle_after
+            if no_hands or parked:
+                self.state = self.IDLE
+                self.idle_since = now
+
+    def should_detect(self, now):
+        return self.state == self.ACTIVE or now - self.last_detect_time >= self.detect_interval
+
+    def mark_detection(self, hands_found, now):
+        """Record a detection result. Returns the idle time if this woke us up"""
+        self.last_detect_time = now
+        if not hands_found:
+            return 0.0
+        return self.wake(now)
+
+    def wake(self, now):
+        """Someone is here (a hand or a key press). Returns the idle time if this woke us up"""
+        self.last_hand_time = now
+        if self.state != self.IDLE:
+            return 0.0
+        self.state = self.ACTIVE
+        if self.game_over_since is not None:
+            self.game_over_since = now
+        return now - self.idle_since
+
+    def draw_attract(self, frame, high_score):
+        """Dim the camera image and draw a pulsing prompt (a few cheap draw calls)"""
+        height, width = frame.shape[:2]
+        ui = Layout(width, height)
+        frame >>= 1
+        pulse = 0.5 + 0.5 * math.sin(time.time() * 2)
+        color = (0, int(150 + 105 * pulse), 255)
+        ui.text(frame, 'AR COIN GAME', ui.point(0.5, 0.5, -220, -60), 2, (0, 215, 255), 4)
+        ui.text(frame, 'Raise your hand to play!', ui.point(0.5, 0.5, -200, 10), 1, color, 2)
+        ui.text(frame, f'High Score: {high_score}', ui.point(0.5, 0.5, -110, 60), 0.8, (255, 255, 0), 2)
@@ -0,0 +1,280 @@
+"""Shared hand-inference pool for several game stations on one machine.
+
+host.py starts one pool and one game process per camera. Each station gets a
+shared-memory block holding one downscaled frame and its latest landmarks:
+
+- A station only submits when its previous frame has been served, so a busy
+  pool makes stations reuse their last landmarks instead of building a queue
+  (the skipped submissions are counted).
+- A dispatcher thread hands pending stations to the workers in round-robin
+  order, so one station can't starve the others.
+- Every worker runs its own MediaPipe model in static image mode, because
+  consecutive frames it sees come from different cameras.
+- Frames are downscaled to fit INFERENCE_SIZE with their aspect ratio kept
+  (the header carries the size), so a 4:3 camera isn't squashed to 16:9
+  before MediaPipe sees the hands.
+"""
+import atexit
+import multiprocessing
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+from pipeline import NUM_LANDMARKS, LandmarkReader
+from startup import warm_up_hands
+
+INFERENCE_SIZE = (640, 480)  # Largest frame submitted; the frame is scaled to fit, keeping its shape
+MAX_HANDS = 4
+
+# Layout of the int64 header at the start of each station block
+STATE = 0               # IDLE, PENDING (frame written) or BUSY (a worker has it)
+FRAME_SEQ = 1
+SUBMITTED_US = 2        # Wall clock time the pending frame was submitted
+LM_SEQ = 3              # Seqlock counter, odd while the landmarks are being written
+LM_FRAME = 4            # Frame number the landmarks were computed from
+NUM_HANDS = 5
+LATENCY_US = 6          # Submit to landmarks for the last frame, queueing included
+INFERENCE_US = 7
+SERVED = 8
+SKIPPED = 9             # Frames not submitted because the previous one was still in the pool
+LATENCY_SUM_US = 10
+INFERENCE_SUM_US = 11
+FRAME_WIDTH = 12        # Size of the pending frame inside the frame area
+FRAME_HEIGHT = 13
+HEADER_FIELDS = 16
+HEADER_BYTES = HEADER_FIELDS * 8
+FRAME_BYTES = INFERENCE_SIZE[0] * INFERENCE_SIZE[1] * 3
+STATION_BYTES = HEADER_BYTES + FRAME_BYTES + MAX_HANDS * NUM_LANDMARKS * 3 * 4
+
+IDLE = 0
+PENDING = 1
+BUSY = 2
+
+
+def _now_us():
+    return int(time.time() * 1e6)
+
+
+def _attach(name):
+    """Open a station block from a game process without unlinking it when the game exits.
+
+    Games are separate programs with their own resource tracker, which would
+    otherwise remove every block they opened on exit. The pool's workers are
+    children of the host and share its tracker, so they open blocks directly.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        resource_tracker.unregister(shm._name, 'shared_memory')  # The host owns it
+    except Exception:
+        pass
+    return shm
+
+
+def _station_views(shm):
+    """Return (header, landmarks) numpy views onto a station block"""
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+    landmarks = np.ndarray((MAX_HANDS, NUM_LANDMARKS, 3), dtype=np.float32,
+                           buffer=shm.buf, offset=HEADER_BYTES + FRAME_BYTES)
+    return header, landmarks
+
+
+def _frame_view(shm, width, height):
+    """View of a width x height frame at the start of a station's frame area"""
+    return np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf, offset=HEADER_BYTES)
+
+
+def inference_size(width, height):
+    """Largest size with the frame's aspect ratio that fits INFERENCE_SIZE"""
+    scale = min(INFERENCE_SIZE[0] / width, INFERENCE_SIZE[1] / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def _pool_worker(station_names, tasks, min_detection_confidence, max_hands):
+    """Run inference for whichever station the dispatcher hands over"""
+    import mediapipe as mp
+
+    blocks = [shared_memory.SharedMemory(name=name) for name in station_names]
+    views = [_station_views(shm) for shm in blocks]
+    frame = None
+    hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=max_hands,
+                                     min_detection_confidence=min_detection_confidence)
+    try:
+        warm_up_hands(hands, *INFERENCE_SIZE)
+        while True:
+            index = tasks.get()
+            if index is None:
+                break
+            header, landmarks = views[index]
+            frame = _frame_view(blocks[index], int(header[FRAME_WIDTH]), int(header[FRAME_HEIGHT]))
+            started = time.perf_counter()
+            result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            inference_us = int((time.perf_counter() - started) * 1e6)
+
+            header[LM_SEQ] += 1  # Odd: readers must retry
+            count = 0
+            if result.multi_hand_landmarks:
+                for hand_landmarks in result.multi_hand_landmarks[:max_hands]:
+                    for i, point in enumerate(hand_landmarks.landmark):
+                        landmarks[count, i] = (point.x, point.y, point.z)
+                    count += 1
+            header[NUM_HANDS] = count
+            header[LM_FRAME] = header[FRAME_SEQ]
+            latency_us = _now_us() - int(header[SUBMITTED_US])
+            header[LATENCY_US] = latency_us
+            header[INFERENCE_US] = inference_us
+            header[LATENCY_SUM_US] += latency_us
+            header[INFERENCE_SUM_US] += inference_us
+            header[SERVED] += 1
+            header[LM_SEQ] += 1  # Even: landmarks consistent again
+            header[STATE] = IDLE
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hands.close()
+        del views, frame
+        for shm in blocks:
+            shm.close()
+
+
+class InferencePool:
+    """Host side: owns the station blocks, the workers and the dispatcher"""
+
+    def __init__(self, num_stations, workers=2, min_detection_confidence=0.7, max_hands=2):
+        self.num_stations = num_stations
+        self.workers = workers
+        self.min_detection_confidence = min_detection_confidence
+        self.max_hands = min(max_hands, MAX_HANDS)
+        self.blocks = []
+        self.headers = []
+        self.processes = []
+        self.tasks = None
+        self.dispatcher = None
+        self.running = False
+        self.last_report = None
+
+    @property
+    def names(self):
+        """Shared memory names to pass to each station's game (--inference=NAME)"""
+        return [shm.name for shm in self.blocks]
+
+    def start(self):
+        self.blocks = [shared_memory.SharedMemory(create=True, size=STATION_BYTES)
+                       for _ in range(self.num_stations)]
+        self.headers = [_station_views(shm)[0] for shm in self.blocks]
+        for header in self.headers:
+            header[:] = 0
+        atexit.register(self.stop)
+
+        self.tasks = multiprocessing.Queue()
+        self.processes = [
+            multiprocessing.Process(target=_pool_worker, name=f'inference-{i}', daemon=True,
+                                    args=(self.names, self.tasks, self.min_detection_confidence,
+                                          self.max_hands))
+            for i in range(self.workers)]
+        for process in self.processes:
+            process.start()
+
+        self.running = True
+        self.dispatcher = threading.Thread(target=self._dispatch, name='dispatcher', daemon=True)
+        self.dispatcher.start()
+        self.last_report = (time.time(), self._totals())
+        print(f"Inference pool: {self.workers} workers for {self.num_stations} stations")
+        return True
+
+    def _dispatch(self):
+        """Queue pending stations, starting one further along each pass"""
+        first = 0
+        while self.running:
+            dispatched = False
+            for offset in range(self.num_stations):
+                index = (first + offset) % self.num_stations
+                header = self.headers[index]
+                if header[STATE] == PENDING:
+                    header[STATE] = BUSY
+                    self.tasks.put(index)
+                    dispatched = True
+            first = (first + 1) % self.num_stations
+            if not dispatched:
+                time.sleep(0.001)
+
+    def healthy(self):
+        return self.running and all(process.is_alive() for process in self.processes)
+
+    def _totals(self):
+        return [(int(h[SERVED]), int(h[SKIPPED]), int(h[LATENCY_SUM_US]), int(h[INFERENCE_SUM_US]))
+                for h in self.headers]
+
+    def report(self):
+        """Print per-station throughput and latency since the last report"""
+        if not self.running:
+            return
+        now = time.time()
+        totals = self._totals()
+        since, previous = self.last_report
+        elapsed = max(now - since, 1e-6)
+        for station, (current, last) in enumerate(zip(totals, previous)):
+            served, skipped, latency_sum, inference_sum = (a - b for a, b in zip(current, last))
+            latency = latency_sum / served / 1000 if served else 0.0
+            inference = inference_sum / served / 1000 if served else 0.0
+            print(f"Station {station + 1}: {served / elapsed:.1f} inferences/s, "
+                  f"{skipped / elapsed:.1f} skipped/s, latency {latency:.1f} ms "
+                  f"(inference {inference:.1f} ms)")
+        self.last_report = (now, totals)
+
+    def stop(self):
+        """Stop the dispatcher and workers and free the station blocks. Safe to call twice"""
+        if not self.running:
+            return
+        self.running = False
+        self.dispatcher.join(timeout=1.0)
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.headers = []
+        for shm in self.blocks:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = []
+
+
+class StationClient(LandmarkReader):
+    """Game side of a station: submit frames, read landmarks like `Pipeline`"""
+    SEQ_FIELD = LM_SEQ
+    FRAME_FIELD = LM_FRAME
+    HANDS_FIELD = NUM_HANDS
+    LATENCY_FIELD = LATENCY_US  # Submit-to-result time, queueing included
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        self.header, self.landmarks = _station_views(self.shm)
+        self.frame = None
+        self.last_landmark_frame = 0
+
+    def submit(self, frame):
+        """Send a frame for inference unless the last one is still in the pool"""
+        if self.header[STATE] != IDLE:
+            self.header[SKIPPED] += 1
+            return False
+        size = inference_size(frame.shape[1], frame.shape[0])
+        if self.frame is None or self.frame.shape[1::-1] != size:
+            self.frame = _frame_view(self.shm, *size)
+        cv2.resize(frame, size, dst=self.frame, interpolation=cv2.INTER_AREA)
+        self.header[FRAME_WIDTH], self.header[FRAME_HEIGHT] = size
+        self.header[FRAME_SEQ] += 1
+        self.header[SUBMITTED_US] = _now_us()
+        self.header[STATE] = PENDING
+        return True
+
+    def close(self):
+        self.header = self.frame = self.landmarks = None
+        self.shm.close()
@@ -0,0 +1,44 @@
+"""Resolution-independent HUD layout.
+
+The HUD was designed on a 1280-wide frame. A `Layout` keeps that design at
+any output width: positions are an anchor in normalized screen units (0..1 of
+the width and height) plus an offset in design pixels, and offsets, sizes,
+font scales and line widths are multiplied by width / DESIGN_WIDTH. The same
+drawing code then fits a 960-wide frame on a small box and a 1920-wide one on
+a big display.
+"""
+import cv2
+
+DESIGN_WIDTH = 1280
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class Layout:
+    def __init__(self, width, height=None):
+        self.fit(width, height or width * 9 // 16)
+
+    def fit(self, width, height):
+        """Lay out for a width x height frame"""
+        self.width = width
+        self.height = height
+        self.scale = width / DESIGN_WIDTH
+
+    def px(self, value):
+        """Design pixels to output pixels"""
+        return int(round(value * self.scale))
+
+    def size(self, value):
+        """Like px, but never below one pixel (sizes, radii, line widths)"""
+        return max(1, self.px(value))
+
+    def point(self, nx, ny, dx=0, dy=0):
+        """Anchor (nx, ny) in screen units, moved by (dx, dy) design pixels"""
+        return int(nx * self.width) + self.px(dx), int(ny * self.height) + self.px(dy)
+
+    def text(self, frame, text, position, font_scale, color, thickness=2):
+        cv2.putText(frame, text, position, FONT, font_scale * self.scale, color, self.size(thickness))
+
+    def box(self, frame, top_left, bottom_right, color, thickness=2):
+        """Rectangle; a negative thickness fills it"""
+        cv2.rectangle(frame, top_left, bottom_right, color,
+                      thickness if thickness < 0 else self.size(thickness))
@@ -0,0 +1,278 @@
+"""Leaderboards: bounded top-K boards and O(log n) rank lookups.
+
+Every score goes on three boards: all-time, today's and its game mode's.
+A board keeps the best `size` entries in a min-heap (a new score only has to
+beat the root) and every score it has seen in a sorted list, so "rank #N of
+M" is one bisect instead of a scan of the history. Entries are appended to a
+JSON-lines file and replayed on startup.
+
+`Leaderboard` runs in-process (with path=None it is a throwaway stand-in for
+tests). To share boards between kiosks on a LAN, run
+
+    python leaderboard.py --host=0.0.0.0 --port=9110
+
+and start the games with --leaderboard=http://<server>:9110, which uses
+`RemoteLeaderboard` with the same methods.
+"""
+import bisect
+import heapq
+import itertools
+import json
+import os
+import threading
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cli import arg_value
+
+ALL_TIME = 'all-time'
+
+
+def daily_board(day=None):
+    return 'daily:' + (day or datetime.now().strftime('%Y-%m-%d'))
+
+
+def mode_board(mode):
+    return 'mode:' + mode
+
+
+class Board:
+    def __init__(self, size=10):
+        self.size = size
+        self.top = []     # Min-heap of (score, -order, entry): the root is the first to drop out
+        self.scores = []  # Every score on the board, ascending
+
+    def add(self, entry, order):
+        """Insert an entry. Returns its rank (ties share the better rank)"""
+        score = entry['score']
+        rank = self.rank(score)
+        bisect.insort(self.scores, score)
+        item = (score, -order, entry)  # On equal scores the older entry stays ahead
+        if len(self.top) < self.size:
+            heapq.heappush(self.top, item)
+        elif item > self.top[0]:
+            heapq.heapreplace(self.top, item)
+        return rank
+
+    def rank(self, score):
+        """1 + number of scores strictly higher"""
+        return len(self.scores) - bisect.bisect_right(self.scores, score) + 1
+
+    def entries(self):
+        return [entry for _, _, entry in sorted(self.top, reverse=True)]
+
+    def __len__(self):
+        return len(self.scores)
+
+
+class Leaderboard:
+    def __init__(self, path='leaderboard.jsonl', size=10, days_kept=7):
+        self.path = path
+        self.size = size
+        self.days_kept = days_kept  # Older daily boards are dropped
+        self.boards = {}
+        self.order = itertools.count()
+        self.lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+        except (OSError, ValueError) as e:
+            print(f"Could not load leaderboard history: {e}")
+        self._prune_days()
+
+    def _add(self, entry):
+        ranks = {}
+        for name in (ALL_TIME, daily_board(entry['date'][:10]), mode_board(entry['mode'])):
+            board = self.boards.setdefault(name, Board(self.size))
+            ranks[name] = {'rank': board.add(entry, next(self.order)), 'of': len(board)}
+        return ranks
+
+    def _prune_days(self):
+        oldest = daily_board((datetime.now() - timedelta(days=self.days_kept)).strftime('%Y-%m-%d'))
+        for name in [n for n in self.boards if n.startswith('daily:') and n < oldest]:
+            del self.boards[name]
+
+    def _record(self, entries):
+        """Add entries and append them to the history file. Returns the last ranks"""
+        with self.lock:
+            ranks = None
+            for entry in entries:
+                ranks = self._add(entry)
+            self._prune_days()
+            if self.path is not None:
+                try:
+                    with open(self.path, 'a') as f:
+                        f.writelines(json.dumps(entry) + '\n' for entry in entries)
+                except OSError as e:
+                    print(f"Could not save leaderboard entry: {e}")
+        return ranks
+
+    def submit(self, score, mode='default', **fields):
+        """Record a finished game. Returns {board: {'rank': N, 'of': M}}"""
+        return self._record([dict(fields, score=score, mode=mode,
+                                  date=datetime.now().strftime('%Y-%m-%d %H:%M'))])
+
+    def restore(self, entries, mode='default'):
+        """Seed the boards from an older top-10 list, keeping its dates"""
+        self._record([dict(entry, mode=entry.get('mode', mode)) for entry in entries])
+
+    def top(self, board=ALL_TIME):
+        with self.lock:
+            return self.boards[board].entries() if board in self.boards else []
+
+    def rank(self, score, board=ALL_TIME):
+        """(rank, board size) the score would have, without recording it"""
+        with self.lock:
+            if board not in self.boards:
+                return 1, 0
+            return self.boards[board].rank(score), len(self.boards[board])
+
+    def __len__(self):
+        return len(self.boards.get(ALL_TIME, ()))
+
+
+class RemoteLeaderboard:
+    """Client for a `LeaderboardServer`. Calls return None if the server is unreachable"""
+
+    def __init__(self, url, timeout=1.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError) as e:
+            print(f"Leaderboard server unavailable: {e}")
+            return None
+
+    def submit(self, score, mode='default', **fields):
+        return self._request('/submit', dict(fields, score=score, mode=mode))
+
+    def top(self, board=ALL_TIME):
+        return self._request('/top?' + urllib.parse.urlencode({'board': board})) or []
+
+    def rank(self, score, board=ALL_TIME):
+        result = self._request('/rank?' + urllib.parse.urlencode({'score': score, 'board': board}))
+        return (result['rank'], result['of']) if result else None
+
+
+class LeaderboardServer:
+    """Serves a `Leaderboard` over HTTP: POST /submit, GET /top, GET /rank"""
+
+    def __init__(self, leaderboard, port=9110, host='127.0.0.1'):
+        self.leaderboard = leaderboard
+        self.port = port
+        self.host = host
+        self.server = None
+
+    def start(self):
+        leaderboard = self.leaderboard
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(url.query))
+                board = query.get('board', ALL_TIME)
+                try:
+                    if url.path == '/top':
+                        self._reply(leaderboard.top(board))
+                    elif url.path == '/rank':
+                        rank, total = leaderboard.rank(int(query['score']), board)
+                        self._reply({'rank': rank, 'of': total})
+                    else:
+                        self.send_error(404)
+                except (KeyError, ValueError):
+                    self.send_error(400)
+
+            def do_POST(self):
+                if self.path != '/submit':
+                    self.send_error(404)
+                    return
+                try:
+                    entry = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                    score = int(entry.pop('score'))
+                    mode = str(entry.pop('mode', 'default'))
+                except (KeyError, ValueError, TypeError):
+                    self.send_error(400)
+                    return
+                self._reply(leaderboard.submit(score, mode, **entry))
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"Could not start leaderboard server: {e}")
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='leaderboard', daemon=True).start()
+        print(f"Leaderboard at http://{self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def submit_scores(leaderboard, scores, mode, ranks, on_done=None):
+    """Submit {key: (score, fields)} and store each reply in ranks[key].
+
+    A `RemoteLeaderboard` is called from a daemon thread, so a slow or
+    unreachable server can't freeze the game loop; ranks fill in as the
+    replies arrive. on_done runs (on the same thread) after the last submit.
+    """
+    def run():
+        for key, (score, fields) in scores.items():
+            ranks[key] = leaderboard.submit(score, mode, **fields)
+        if on_done is not None:
+            on_done()
+
+    if isinstance(leaderboard, RemoteLeaderboard):
+        threading.Thread(target=run, name='leaderboard-submit', daemon=True).start()
+    else:
+        run()
+
+
+def format_rank(ranks, board=ALL_TIME):
+    """'#N of M' for a submit() result, or '' if the board isn't in it"""
+    if not ranks or board not in ranks:
+        return ''
+    return f"#{ranks[board]['rank']} of {ranks[board]['of']}"
+
+
+def main():
+    server = LeaderboardServer(Leaderboard(arg_value('file', 'leaderboard.jsonl')),
+                               port=int(arg_value('port', 9110)), host=arg_value('host', '127.0.0.1'))
+    if not server.start():
+        return
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
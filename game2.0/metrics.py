@@ -0,0 +1,154 @@
+"""Runtime metrics with an optional localhost endpoint in Prometheus text format.
+
+Only the standard library is used. The game thread updates plain counters
+and histogram buckets without taking any lock; the HTTP server runs on its
+own daemon thread and renders whatever values are current when scraped, so a
+slow or stuck scraper can never hold up a frame.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FRAME_BUCKETS = (0.008, 0.016, 0.025, 0.033, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5)
+LATENCY_BUCKETS = (0.002, 0.005, 0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.2, 0.5)
+SAVE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self):
+        counts = list(self.counts)
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f'{self.name}_sum {self.sum}')
+        lines.append(f'{self.name}_count {cumulative}')
+        return lines
+
+
+class Counter:
+    """Counter with an optional single label (e.g. errors by kind).
+
+    Starts at 0 (per known label value) so the series exists from the first
+    scrape after a restart, not only after the first increment.
+    """
+
+    def __init__(self, name, help_text, label=None, label_values=()):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.values = {None: 0} if label is None else dict.fromkeys(label_values, 0)
+
+    def inc(self, label_value=None, amount=1):
+        self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_value, value in list(self.values.items()):
+            if self.label is None:
+                lines.append(f'{self.name} {value}')
+            else:
+                lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value}')
+        return lines
+
+
+class Gauge:
+    """Gauge read from a callable at scrape time"""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self):
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge',
+                f'{self.name} {value}']
+
+
+class Metrics:
+    """The game's metrics; add gauges with `gauge()` once their source exists"""
+
+    def __init__(self):
+        self.frame_time = Histogram('ar_frame_time_seconds', 'Time between presented frames',
+                                    FRAME_BUCKETS)
+        self.detection_latency = Histogram('ar_detection_latency_seconds',
+                                           'Hand inference time per processed frame',
+                                           LATENCY_BUCKETS)
+        self.save_latency = Histogram('ar_save_latency_seconds', 'Time to write game_data.json',
+                                      SAVE_BUCKETS)
+        self.games_played = Counter('ar_games_played_total', 'Games finished since start')
+        self.errors = Counter('ar_errors_total', 'Errors by kind', label='kind',
+                              label_values=('audio', 'images', 'save'))
+        self.gauges = []
+
+    def gauge(self, name, help_text, read):
+        self.gauges.append(Gauge(name, help_text, read))
+
+    def render(self):
+        lines = []
+        for metric in (self.frame_time, self.detection_latency, self.save_latency,
+                       self.games_played, self.errors, *self.gauges):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serves `metrics.render()` at http://127.0.0.1:<port>/metrics"""
+
+    def __init__(self, metrics, port=9108, host='127.0.0.1'):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.server = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"Could not start metrics endpoint: {e}")
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True).start()
+        print(f"Metrics at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,79 @@
+"""Motion gate that skips hand inference when the scene hasn't changed.
+
+Each camera frame is shrunk to a tiny grayscale thumbnail and compared with
+the thumbnail from the last frame that was actually sent to MediaPipe. If too
+few pixels changed, the caller reuses the previous landmarks. Comparing with
+the last inference frame (rather than the previous frame) means slow drifts
+still add up and trigger a new inference.
+"""
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    def __init__(self, enabled=True, size=(64, 36), pixel_threshold=12,
+                 changed_fraction=0.003, max_skip=15):
+        self.enabled = enabled
+        self.size = size
+        self.pixel_threshold = pixel_threshold      # Gray levels a pixel must change by
+        self.changed_fraction = changed_fraction    # Share of pixels that must change
+        self.max_skip = max_skip                    # Force an inference after this many skips
+        self.reference = None
+        self.pending = None                         # Thumbnail of the last checked frame
+        self.mask = None
+        self.skipped_in_row = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def update(self, frame):
+        """Return True if the frame should go through hand inference.
+
+        For callers that infer on every frame the gate lets through. Callers
+        that only infer some frames use check() and then commit() or skip().
+        """
+        if self.check(frame):
+            self.commit()
+            return True
+        self.skip()
+        return False
+
+    def check(self, frame):
+        """True if the frame changed enough since the last inference frame (counts nothing)"""
+        if not self.enabled:
+            return True
+
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        self.pending = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        if self.reference is None or self.reference.shape != self.pending.shape:
+            self.mask = np.ones(self.pending.shape, dtype=bool)
+            return True
+
+        self.mask = cv2.absdiff(self.pending, self.reference) > self.pixel_threshold
+        return self.mask.mean() >= self.changed_fraction or self.skipped_in_row >= self.max_skip
+
+    def commit(self):
+        """The last checked frame went through inference: compare later frames with it"""
+        self.checked += 1
+        if self.pending is not None:
+            self.reference = self.pending
+        self.skipped_in_row = 0
+
+    def skip(self):
+        """Inference was due, but the last checked frame reused the previous result"""
+        self.checked += 1
+        self.skipped += 1
+        self.skipped_in_row += 1
+
+    def motion_bbox(self, width, height):
+        """Bounding box (x1, y1, x2, y2) of the moving area in frame pixels, or None"""
+        if self.mask is None or not self.mask.any():
+            return None
+        ys, xs = np.nonzero(self.mask)
+        scale_x = width / self.size[0]
+        scale_y = height / self.size[1]
+        return (int(xs.min() * scale_x), int(ys.min() * scale_y),
+                int((xs.max() + 1) * scale_x), int((ys.max() + 1) * scale_y))
+
+    @property
+    def skip_rate(self):
+        return self.skipped / self.checked if self.checked else 0.0
@@ -0,0 +1,74 @@
+"""Frame pacing: hold a steady target FPS instead of busy-looping on waitKey(1).
+
+`FramePacer.wait()` replaces the `cv2.waitKey(1)` at the end of the loop. It
+spends most of the frame's leftover budget inside the display's `poll_key`
+(so key presses still return immediately), finishes the last couple of
+milliseconds with a short `time.sleep`, and records frame times, jitter and
+missed deadlines.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+
+class FramePacer:
+    def __init__(self, target_fps=30, display=None, margin=0.002, history=240):
+        self.target_fps = target_fps
+        self.display = display          # Polled for input while waiting (display.py)
+        self.margin = margin            # Left for time.sleep, waiting for input overshoots
+        self.frame_times = deque(maxlen=history)
+        self.frames = 0
+        self.missed = 0
+        self.last_end = None
+        self.deadline = None
+
+    def wait(self, target_fps=None):
+        """Wait for the next frame deadline while polling input. Returns key & 0xFF"""
+        budget = 1.0 / (target_fps or self.target_fps)
+        now = time.perf_counter()
+        if self.deadline is None:
+            self.deadline = now + budget
+
+        remaining = self.deadline - now
+        key = -1
+        if self.display is not None:
+            key = self.display.poll_key(max(1, int((remaining - self.margin) * 1000)))
+        if key == -1:
+            remaining = self.deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        end = time.perf_counter()
+        if self.last_end is not None:
+            self.frame_times.append(end - self.last_end)
+        self.last_end = end
+        self.frames += 1
+
+        if end > self.deadline + budget * 0.5:
+            # Missed by more than half a frame: don't try to catch up with a burst
+            self.missed += 1
+            self.deadline = end + budget
+        else:
+            self.deadline += budget
+        return key & 0xFF
+
+    @property
+    def fps(self):
+        # Snapshot first: the metrics thread reads this while the game thread appends
+        frame_times = tuple(self.frame_times)
+        if not frame_times:
+            return 0.0
+        return len(frame_times) / sum(frame_times)
+
+    @property
+    def jitter_ms(self):
+        """Standard deviation of recent frame times in milliseconds"""
+        frame_times = tuple(self.frame_times)
+        if len(frame_times) < 2:
+            return 0.0
+        return float(np.std(frame_times)) * 1000
+
+    def report(self):
+        print(f"Frame pacing: {self.fps:.1f} FPS (target {self.target_fps}), "
+              f"jitter {self.jitter_ms:.1f} ms, missed {self.missed}/{self.frames} deadlines")
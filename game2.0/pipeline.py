@@ -0,0 +1,363 @@
+"""Optional multi-process capture / hand inference pipeline.
+
+Camera capture and MediaPipe inference run in their own processes so they no
+longer compete with the game loop for the GIL. Frames are read by the camera
+straight into a shared-memory ring buffer and the landmarks come back through
+a small shared block guarded by a sequence counter, so nothing is pickled or
+copied between processes.
+"""
+import atexit
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from camera import Camera
+from motion import MotionGate
+from startup import warm_up_hands
+
+NUM_SLOTS = 4           # Frames kept in the ring (reader has NUM_SLOTS-1 frames of slack)
+MAX_HANDS = 4           # Landmark slots in the state block (one hand per player)
+NUM_LANDMARKS = 21
+
+# Layout of the int64 header at the start of the state block
+FRAME_SEQ = 0           # Number of the newest complete frame (frame n lives in slot n % NUM_SLOTS)
+HEIGHT = 1
+WIDTH = 2
+STATUS = 3              # 0 = starting, 1 = running, -1 = failed / stopped
+LM_SEQ = 4              # Seqlock counter, odd while the landmarks are being written
+LM_FRAME = 5            # Frame number the landmarks were computed from
+NUM_HANDS = 6
+DETECT_INTERVAL_MS = 7  # Minimum time between inferences (idle throttling), 0 = every frame
+MOTION_CHECKED = 8      # Frames seen by the motion gate
+MOTION_SKIPPED = 9      # Frames the motion gate kept away from MediaPipe
+LM_LATENCY_US = 10      # Inference time for the published landmarks
+HEADER_FIELDS = 16
+HEADER_BYTES = HEADER_FIELDS * 8
+
+STATUS_STARTING = 0
+STATUS_RUNNING = 1
+STATUS_FAILED = -1
+
+
+def _state_views(state_shm):
+    """Return (header, landmarks) numpy views onto the shared state block"""
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=state_shm.buf)
+    landmarks = np.ndarray((MAX_HANDS, NUM_LANDMARKS, 3), dtype=np.float32,
+                           buffer=state_shm.buf, offset=HEADER_BYTES)
+    return header, landmarks
+
+
+def landmark_results(points):
+    """Wrap (hands, 21, 3) landmark arrays in the shape `Hands.process()` returns"""
+    from mediapipe.framework.formats import landmark_pb2
+
+    if len(points) == 0:
+        return SimpleNamespace(multi_hand_landmarks=None)
+    hands = []
+    for hand in points:
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in hand:
+            landmark_list.landmark.add(x=float(x), y=float(y), z=float(z))
+        hands.append(landmark_list)
+    return SimpleNamespace(multi_hand_landmarks=hands)
+
+
+class LandmarkReader:
+    """Game-side reader for landmarks a worker publishes under a seqlock.
+
+    Subclasses provide `header`, `landmarks` and `last_landmark_frame`, and
+    name their header fields if their layout differs from the pipeline's.
+    """
+    SEQ_FIELD = LM_SEQ
+    FRAME_FIELD = LM_FRAME
+    HANDS_FIELD = NUM_HANDS
+    LATENCY_FIELD = LM_LATENCY_US
+
+    def take_detection_latency(self):
+        """Latency in seconds if new landmarks arrived since the last call"""
+        landmark_frame = int(self.header[self.FRAME_FIELD])
+        if landmark_frame == self.last_landmark_frame:
+            return None
+        self.last_landmark_frame = landmark_frame
+        return int(self.header[self.LATENCY_FIELD]) / 1e6
+
+    def hand_results(self):
+        """Return the newest landmarks in the same shape as `Hands.process()`"""
+        while True:
+            seq = int(self.header[self.SEQ_FIELD])
+            if seq % 2:
+                time.sleep(0)  # The writer is mid-update; let it finish
+                continue
+            count = int(self.header[self.HANDS_FIELD])
+            points = self.landmarks[:count].copy()
+            if int(self.header[self.SEQ_FIELD]) == seq:
+                return landmark_results(points)
+
+
+def _slot_views(frames_shm, slot_bytes, height, width):
+    """Return one numpy view per ring slot, shaped like a camera frame"""
+    return [np.ndarray((height, width, 3), dtype=np.uint8, buffer=frames_shm.buf,
+                       offset=i * slot_bytes)
+            for i in range(NUM_SLOTS)]
+
+
+def _parent_alive(parent_pid):
+    return os.getppid() == parent_pid
+
+
+def _capture_worker(camera_index, target_width, frames_name, state_name, slot_bytes,
+                    stop_event, parent_pid):
+    """Read camera frames directly into the shared ring buffer"""
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    state_shm = shared_memory.SharedMemory(name=state_name)
+    header, landmarks = _state_views(state_shm)
+    slots = []
+    # Frames stay unmirrored here; the game mirrors while scaling and the
+    # inference worker mirrors the landmark coordinates instead
+    camera = Camera(camera_index, target_width=target_width, mirror=False)
+    try:
+        if not camera.open():
+            header[STATUS] = STATUS_FAILED
+            return
+        cap = camera.cap
+        ret, first = cap.read()
+        if not ret or first.nbytes > slot_bytes:
+            print("Pipeline: could not read a frame that fits the shared ring buffer")
+            header[STATUS] = STATUS_FAILED
+            return
+
+        height, width = first.shape[:2]
+        slots = _slot_views(frames_shm, slot_bytes, height, width)
+        slots[1][:] = first
+        header[HEIGHT] = height
+        header[WIDTH] = width
+        header[FRAME_SEQ] = 1
+        header[STATUS] = STATUS_RUNNING
+
+        # A video file is replayed at its own frame rate and looped like
+        # Camera.read does; a camera paces itself
+        frame_interval = 0.0
+        if camera.is_file:
+            file_fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_interval = 1.0 / (file_fps if file_fps > 0 else camera.target_fps)
+        next_frame = time.perf_counter()
+
+        frame_number = 1
+        while not stop_event.is_set() and _parent_alive(parent_pid):
+            if frame_interval:
+                next_frame += frame_interval
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame = time.perf_counter()  # Behind: don't race to catch up
+            slot = slots[(frame_number + 1) % NUM_SLOTS]
+            ret, image = cap.read(slot)
+            if not ret and camera.is_file and camera.loop:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, image = cap.read(slot)
+            if not ret:
+                break
+            if image is not slot and not np.may_share_memory(image, slot):
+                slot[:] = image  # Backend ignored the output buffer
+            frame_number += 1
+            header[FRAME_SEQ] = frame_number
+    finally:
+        header[STATUS] = STATUS_FAILED
+        camera.release()
+        del slots, header, landmarks
+        frames_shm.close()
+        state_shm.close()
+
+
+def _inference_worker(frames_name, state_name, slot_bytes, stop_event, parent_pid,
+                      mirror, min_detection_confidence, motion_gating, max_hands):
+    """Run MediaPipe on the newest frame and publish landmarks to shared memory"""
+    import mediapipe as mp
+
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    state_shm = shared_memory.SharedMemory(name=state_name)
+    header, landmarks = _state_views(state_shm)
+    slots = []
+    motion_gate = MotionGate(enabled=motion_gating)
+    hands = mp.solutions.hands.Hands(max_num_hands=max_hands,
+                                     min_detection_confidence=min_detection_confidence)
+    try:
+        warm_up_hands(hands)
+        while header[STATUS] == STATUS_STARTING and not stop_event.is_set():
+            time.sleep(0.005)
+        if header[STATUS] != STATUS_RUNNING:
+            return
+        slots = _slot_views(frames_shm, slot_bytes, int(header[HEIGHT]), int(header[WIDTH]))
+
+        last_frame = 0
+        last_run = 0.0
+        while not stop_event.is_set() and _parent_alive(parent_pid):
+            frame_number = int(header[FRAME_SEQ])
+            throttled = time.time() - last_run < header[DETECT_INTERVAL_MS] / 1000.0
+            if frame_number == last_frame or throttled:
+                if header[STATUS] != STATUS_RUNNING:
+                    break
+                time.sleep(0.001)
+                continue
+
+            last_frame = frame_number
+            moved = motion_gate.update(slots[frame_number % NUM_SLOTS])
+            header[MOTION_CHECKED] = motion_gate.checked
+            header[MOTION_SKIPPED] = motion_gate.skipped
+            if not moved:
+                continue  # Scene is static, the published landmarks still hold
+
+            last_run = time.time()
+            started = time.perf_counter()
+            rgb_frame = cv2.cvtColor(slots[frame_number % NUM_SLOTS], cv2.COLOR_BGR2RGB)
+            result = hands.process(rgb_frame)
+            latency_us = int((time.perf_counter() - started) * 1e6)
+
+            header[LM_SEQ] += 1  # Odd: readers must retry
+            count = 0
+            if result.multi_hand_landmarks:
+                for hand_landmarks in result.multi_hand_landmarks[:max_hands]:
+                    for i, point in enumerate(hand_landmarks.landmark):
+                        x = 1.0 - point.x if mirror else point.x
+                        landmarks[count, i] = (x, point.y, point.z)
+                    count += 1
+            header[NUM_HANDS] = count
+            header[LM_FRAME] = frame_number
+            header[LM_LATENCY_US] = latency_us
+            header[LM_SEQ] += 1  # Even: landmarks consistent again
+    finally:
+        hands.close()
+        del slots, header, landmarks
+        frames_shm.close()
+        state_shm.close()
+
+
+class Pipeline(LandmarkReader):
+    """Capture and hand inference running in worker processes.
+
+    `read()` mirrors `cv2.VideoCapture.read()` and returns a view onto the
+    shared ring, and `hand_results()` returns an object shaped like the result
+    of `Hands.process()` so the game loop can use either path unchanged.
+    """
+
+    def __init__(self, camera_index=0, target_width=1280, max_frame_size=(1920, 1080),
+                 mirror=True, min_detection_confidence=0.7, motion_gating=True, max_hands=2):
+        self.camera_index = camera_index
+        self.target_width = target_width
+        self.slot_bytes = max_frame_size[0] * max_frame_size[1] * 3
+        self.mirror = mirror
+        self.min_detection_confidence = min_detection_confidence
+        self.motion_gating = motion_gating
+        self.max_hands = min(max_hands, MAX_HANDS)
+        self.processes = []
+        self.frames_shm = None
+        self.state_shm = None
+        self.header = None
+        self.landmarks = None
+        self.slots = []
+        self.last_frame = 0
+        self.last_landmark_frame = 0
+        self.stop_event = None
+
+    def start(self, timeout=10.0):
+        """Fork the workers and wait for the first frame. Returns False on failure"""
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            # Spawned children would re-run the game script on import
+            print("Pipeline mode needs the 'fork' start method, using single process")
+            return False
+
+        ctx = multiprocessing.get_context('fork')
+        self.frames_shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * NUM_SLOTS)
+        self.state_shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_BYTES + MAX_HANDS * NUM_LANDMARKS * 3 * 4)
+        self.header, self.landmarks = _state_views(self.state_shm)
+        self.header[:] = 0
+        self.stop_event = ctx.Event()
+        atexit.register(self.stop)
+
+        parent_pid = os.getpid()
+        self.processes = [
+            ctx.Process(target=_capture_worker, name='capture', daemon=True,
+                        args=(self.camera_index, self.target_width, self.frames_shm.name, self.state_shm.name,
+                              self.slot_bytes, self.stop_event, parent_pid)),
+            ctx.Process(target=_inference_worker, name='inference', daemon=True,
+                        args=(self.frames_shm.name, self.state_shm.name, self.slot_bytes,
+                              self.stop_event, parent_pid, self.mirror,
+                              self.min_detection_confidence, self.motion_gating, self.max_hands)),
+        ]
+        for process in self.processes:
+            process.start()
+
+        deadline = time.time() + timeout
+        while self.header[STATUS] == STATUS_STARTING and time.time() < deadline:
+            time.sleep(0.01)
+        if self.header[STATUS] != STATUS_RUNNING:
+            print("Pipeline failed to start, using single process")
+            self.stop()
+            return False
+
+        self.slots = _slot_views(self.frames_shm, self.slot_bytes,
+                                 int(self.header[HEIGHT]), int(self.header[WIDTH]))
+        return True
+
+    @property
+    def frame_size(self):
+        """(width, height) of the raw frames in the ring"""
+        return int(self.header[WIDTH]), int(self.header[HEIGHT])
+
+    def healthy(self):
+        return (self.header is not None and self.header[STATUS] == STATUS_RUNNING
+                and all(process.is_alive() for process in self.processes))
+
+    def read(self, timeout=1.0):
+        """Wait for a frame newer than the last one read and return (ret, view)"""
+        deadline = time.time() + timeout
+        while self.healthy():
+            frame_number = int(self.header[FRAME_SEQ])
+            if frame_number != self.last_frame:
+                self.last_frame = frame_number
+                return True, self.slots[frame_number % NUM_SLOTS]
+            if time.time() > deadline:
+                break
+            time.sleep(0.0005)
+        return False, None
+
+    @property
+    def skip_rate(self):
+        """Share of frames the motion gate kept away from MediaPipe"""
+        checked = int(self.header[MOTION_CHECKED]) if self.header is not None else 0
+        return int(self.header[MOTION_SKIPPED]) / checked if checked else 0.0
+
+    def set_detection_interval(self, seconds):
+        """Throttle the inference worker (used while idle), 0 to run every frame"""
+        self.header[DETECT_INTERVAL_MS] = int(seconds * 1000)
+
+    def stop(self):
+        """Stop the workers and release the shared memory. Safe to call twice"""
+        if self.stop_event is None:
+            return
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=1.0)
+        self.processes = []
+        self.slots = []
+        self.header = None
+        self.landmarks = None
+        for shm in (self.frames_shm, self.state_shm):
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.frames_shm = None
+        self.state_shm = None
+        self.stop_event = None
@@ -0,0 +1,119 @@
+"""Players, stable hand identity and batched collision checks.
+
+MediaPipe returns hands in no particular order, so using the list index as
+the hand id makes trails and colors jump between hands. `HandTracker` keeps
+an id per hand by greedily matching each frame's fingertips to the closest
+known track, and binds every new track to the player whose screen strip it
+first appeared in. `batch_touches` tests every hand against every object in
+one vectorized pass.
+"""
+import numpy as np
+
+PLAYER_COLORS = [(0, 0, 255), (255, 0, 0), (0, 255, 0), (255, 255, 0)]  # Red, Blue, Green, Yellow
+
+
+class Player:
+    def __init__(self, index, region):
+        self.index = index
+        self.region = region  # (x1, x2) screen strip the player's coins fall in
+        self.reset()
+
+    def reset(self):
+        self.score = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.missed = 0
+        self.coins_caught = 0
+        self.powerups_collected = 0
+        self.active_powerups = {}  # type -> deadline tick on the scheduler clock
+        self.fall_speed = 0
+        self.coins = []
+        self.out = False
+
+    @property
+    def name(self):
+        return f'P{self.index + 1}'
+
+    @property
+    def color(self):
+        return PLAYER_COLORS[self.index % len(PLAYER_COLORS)]
+
+
+def split_regions(screen_width, num_players):
+    """Divide the screen into equal vertical strips, one per player"""
+    bounds = [screen_width * i // num_players for i in range(num_players + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(num_players)]
+
+
+class HandTracker:
+    def __init__(self, max_distance=200, max_missing=10):
+        self.max_distance = max_distance
+        self.max_missing = max_missing  # Frames a track survives without a match
+        self.tracks = {}  # track id -> {'position', 'missing', 'player'}
+        self.next_id = 0
+
+    def reset(self):
+        self.tracks.clear()
+
+    def update(self, points):
+        """Match this frame's fingertips to tracks. Returns a track id per point"""
+        track_ids = list(self.tracks)
+        ids = [None] * len(points)
+        if points and track_ids:
+            current = np.asarray(points, dtype=np.float32)
+            previous = np.asarray([self.tracks[t]['position'] for t in track_ids], dtype=np.float32)
+            distances = np.linalg.norm(current[:, None, :] - previous[None, :, :], axis=2)
+            # Greedy nearest-neighbour: closest pairs first, each side used once
+            used_tracks = set()
+            for flat in np.argsort(distances, axis=None):
+                i, j = divmod(int(flat), len(track_ids))
+                if distances[i, j] > self.max_distance:
+                    break
+                if ids[i] is None and j not in used_tracks:
+                    ids[i] = track_ids[j]
+                    used_tracks.add(j)
+
+        for i, point in enumerate(points):
+            if ids[i] is None:
+                ids[i] = self.next_id
+                self.tracks[self.next_id] = {'player': None}
+                self.next_id += 1
+            self.tracks[ids[i]]['position'] = point
+            self.tracks[ids[i]]['missing'] = 0
+
+        seen = set(ids)
+        for track_id in list(self.tracks):
+            if track_id not in seen:
+                self.tracks[track_id]['missing'] += 1
+                if self.tracks[track_id]['missing'] > self.max_missing:
+                    del self.tracks[track_id]
+        return ids
+
+    def player_for(self, track_id, players):
+        """Player a track belongs to, bound by screen strip the first time it's seen"""
+        track = self.tracks[track_id]
+        if track['player'] is None:
+            x = min(max(track['position'][0], players[0].region[0]), players[-1].region[1] - 1)
+            track['player'] = next(p.index for p in players if p.region[0] <= x < p.region[1])
+        return players[track['player']]
+
+
+def batch_touches(hands, magnets, objects, sizes, owners, hand_owners):
+    """(hands x objects) bool matrix of which hand touches which object.
+
+    objects are top-left corners with per-object sizes; a magnet hand reaches
+    1.5x the object size instead of its radius. Objects with owner -1 can be
+    touched by anyone, others only by hands of the owning player.
+    """
+    if len(hands) == 0 or len(objects) == 0:
+        return np.zeros((len(hands), len(objects)), dtype=bool)
+    hands = np.asarray(hands, dtype=np.float32)
+    objects = np.asarray(objects, dtype=np.float32)
+    sizes = np.asarray(sizes)
+    centers = objects + (sizes // 2)[:, None]
+    distances = np.hypot(centers[None, :, 0] - hands[:, None, 0],
+                         centers[None, :, 1] - hands[:, None, 1])
+    reach = np.where(np.asarray(magnets)[:, None], sizes[None, :] * 1.5, (sizes // 2)[None, :])
+    owners = np.asarray(owners)
+    allowed = (owners[None, :] < 0) | (owners[None, :] == np.asarray(hand_owners)[:, None])
+    return (distances < reach) & allowed
@@ -0,0 +1,106 @@
+"""Gameplay recorder that never slows the game loop down.
+
+Composited frames are copied into a bounded queue and a background thread
+encodes them with `cv2.VideoWriter`. If the encoder falls behind and the
+queue is full, the frame is dropped (and counted) instead of blocking.
+Stopping a recording only queues an end marker: the encoder finishes the
+queued frames, closes the file and prints the counts on its own thread.
+"""
+import os
+import queue
+import threading
+from datetime import datetime
+
+import cv2
+
+from layout import Layout
+
+CODECS = {
+    'mp4': 'mp4v',
+    'avi': 'MJPG',
+}
+
+
+class Recorder:
+    def __init__(self, directory='recordings', fps=30, container='mp4', queue_size=30):
+        self.directory = directory
+        self.fps = fps
+        self.container = container
+        self.queue_size = queue_size
+        self.frames = None
+        self.thread = None
+        self.path = None
+        self.stats = None       # {'recorded', 'dropped'} of the current recording
+        self.finishing = []     # Encoder threads still draining stopped recordings
+
+    @property
+    def recording(self):
+        return self.thread is not None
+
+    def toggle(self, frame_size):
+        if self.recording:
+            self.stop()
+        else:
+            self.start(frame_size)
+
+    def start(self, frame_size):
+        """Start a new recording of (width, height) frames"""
+        os.makedirs(self.directory, exist_ok=True)
+        name = datetime.now().strftime('game_%Y%m%d_%H%M%S') + '.' + self.container
+        self.path = os.path.join(self.directory, name)
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*CODECS[self.container]),
+                                 self.fps, frame_size)
+        if not writer.isOpened():
+            print(f"Could not open video writer for {self.path}")
+            return
+        self.frames = queue.Queue(maxsize=self.queue_size + 1)  # Room for the end marker
+        self.stats = {'recorded': 0, 'dropped': 0}
+        self.thread = threading.Thread(target=self._encode,
+                                       args=(writer, self.frames, self.path, self.stats),
+                                       name='recorder', daemon=True)
+        self.thread.start()
+        print(f"Recording to {self.path}")
+
+    def submit(self, frame):
+        """Queue a copy of the frame, or drop it if the encoder is behind"""
+        if not self.recording:
+            return
+        if self.frames.qsize() >= self.queue_size:
+            self.stats['dropped'] += 1
+            return
+        self.frames.put_nowait(frame.copy())  # Only this thread puts, so there is room
+
+    def stop(self):
+        """End the recording without waiting: the encoder finishes and saves in the background"""
+        if not self.recording:
+            return
+        self.frames.put_nowait(None)
+        self.finishing = [thread for thread in self.finishing if thread.is_alive()] + [self.thread]
+        self.thread = None
+        self.frames = None
+
+    def close(self):
+        """Stop recording and wait for every file to be written (at shutdown)"""
+        self.stop()
+        for thread in self.finishing:
+            thread.join()
+        self.finishing = []
+
+    @staticmethod
+    def _encode(writer, frames, path, stats):
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                writer.write(frame)
+                stats['recorded'] += 1
+        finally:
+            writer.release()
+        print(f"Saved {path}: {stats['recorded']} frames recorded, {stats['dropped']} dropped")
+
+    def draw_indicator(self, frame):
+        if self.recording:
+            ui = Layout(frame.shape[1], frame.shape[0])
+            cv2.circle(frame, ui.point(0.5, 0, -40, 25), ui.size(8), (0, 0, 255), -1)
+            ui.text(frame, 'REC', ui.point(0.5, 0, -25, 33), 0.7, (0, 0, 255), 2)
@@ -0,0 +1,60 @@
+"""Deadline scheduler for power-ups, spawns and other timed effects.
+
+Timers are kept in a heap ordered by deadline on the game clock (one tick per
+played frame), so `advance()` only does work when something is actually due
+instead of every timer being decremented every frame. Each timer has a key;
+scheduling a key again replaces the old timer, and `remaining()` gives HUD
+countdowns straight from the deadline.
+"""
+import heapq
+import itertools
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0
+        self._heap = []
+        self._timers = {}  # key -> heap entry
+        self._counter = itertools.count()
+
+    def schedule(self, delay, callback=None, key=None):
+        """Run callback after `delay` ticks. Replaces any timer with the same key"""
+        if key is None:
+            key = ('timer', next(self._counter))
+        self.cancel(key)
+        entry = [self.now + delay, next(self._counter), key, callback, True]
+        self._timers[key] = entry
+        heapq.heappush(self._heap, entry)
+        return key
+
+    def cancel(self, key):
+        entry = self._timers.pop(key, None)
+        if entry is not None:
+            entry[4] = False  # Dropped lazily when it reaches the top of the heap
+
+    def active(self, key):
+        return key in self._timers
+
+    def remaining(self, key):
+        """Ticks left before the timer fires, 0 if it isn't scheduled"""
+        entry = self._timers.get(key)
+        return entry[0] - self.now if entry is not None else 0
+
+    def advance(self, ticks=1):
+        """Move the clock forward and fire every timer that has come due"""
+        self.now += ticks
+        while self._heap and self._heap[0][0] <= self.now:
+            deadline, _, key, callback, alive = heapq.heappop(self._heap)
+            if not alive:
+                continue
+            del self._timers[key]
+            if callback is not None:
+                callback()
+
+    def __len__(self):
+        """Heap entries, including cancelled ones not dropped yet"""
+        return len(self._heap)
+
+    def clear(self):
+        self._heap.clear()
+        self._timers.clear()
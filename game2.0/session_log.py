@@ -0,0 +1,57 @@
+"""Per-game event log for offline analysis (see analytics.py).
+
+Events are appended to column lists (kind, time, player, x, y, speed, value)
+while the game runs, and the whole game is written as one JSON file when it
+ends, so logging costs a few list appends per event and no I/O mid-game.
+
+Event kinds and what `value` holds:
+    catch    combo after the catch
+    miss     the player's missed count
+    bomb     1 if a shield absorbed it, 0 if the player was knocked out
+    powerup  0 (the type is not logged)
+    detect   inference latency in milliseconds
+    tick     the player's score (sampled once per second for difficulty curves)
+"""
+import json
+import os
+from datetime import datetime
+
+COLUMNS = ('kind', 't', 'player', 'x', 'y', 'speed', 'value')
+
+
+class SessionLog:
+    def __init__(self, enabled=True, directory='sessions'):
+        self.enabled = enabled
+        self.directory = directory
+        self.meta = None
+        self.columns = None
+
+    def start(self, **meta):
+        """Begin logging a new game; meta is stored alongside the events"""
+        if not self.enabled:
+            return
+        self.meta = dict(meta, started=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        self.columns = {name: [] for name in COLUMNS}
+
+    def record(self, kind, t, player=0, x=0, y=0, speed=0, value=0):
+        if self.columns is None:
+            return
+        for name, item in zip(COLUMNS, (kind, round(t, 3), player, x, y, speed, value)):
+            self.columns[name].append(item)
+
+    def finish(self, **summary):
+        """Write the game to disk and stop logging until the next start()"""
+        if self.columns is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = datetime.now().strftime('session_%Y%m%d_%H%M%S_%f') + '.json'
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'w') as f:
+                json.dump({'meta': dict(self.meta, **summary), 'events': self.columns},
+                          f, separators=(',', ':'))
+        except OSError as e:
+            print(f"Could not save session log: {e}")
+            path = None
+        self.columns = None
+        return path
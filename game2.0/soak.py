@@ -0,0 +1,107 @@
+"""Soak testing: track memory growth over a long headless or replayed run.
+
+`SoakMonitor` samples tracemalloc and the process RSS every `interval`
+seconds, together with the size of the game structures that can grow or churn
+(trails, particles, power-ups, leaderboard, achievements). At the end it
+reports the allocation sites that grew the most since the first sample, and
+fails if RSS or traced memory grew by more than the threshold.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+MB = 1024 * 1024
+
+
+def current_rss():
+    """Resident set size in bytes (peak RSS where /proc isn't available)"""
+    try:
+        with open(f'/proc/{os.getpid()}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class SoakMonitor:
+    def __init__(self, duration, structures, interval=60.0, threshold_mb=50.0,
+                 warmup=120.0, top=10):
+        self.duration = duration
+        self.structures = structures      # name -> callable returning its size
+        self.interval = interval
+        self.threshold = threshold_mb * MB
+        self.warmup = warmup              # Caches and models settle before the baseline
+        self.top = top
+        self.start_time = None
+        self.next_sample = None
+        self.baseline = None
+        self.last_snapshot = None
+        self.samples = []
+
+    def start(self):
+        tracemalloc.start(10)
+        self.start_time = time.time()
+        self.next_sample = self.start_time + self.warmup
+        print(f"Soak: running for {self.duration / 3600:.2f}h, sampling every {self.interval:.0f}s")
+
+    @property
+    def finished(self):
+        return time.time() - self.start_time >= self.duration
+
+    def tick(self):
+        """Call once per frame; samples only when the interval has passed"""
+        now = time.time()
+        if now < self.next_sample:
+            return
+        self.next_sample = now + self.interval
+        self.sample(now)
+
+    def sample(self, now):
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        traced, _ = tracemalloc.get_traced_memory()
+        sizes = {name: size() for name, size in self.structures.items()}
+        record = {'elapsed': now - self.start_time, 'rss': current_rss(),
+                  'traced': traced, 'sizes': sizes}
+        self.samples.append(record)
+        if self.baseline is None:
+            self.baseline = (snapshot, record)
+        self.last_snapshot = snapshot
+
+        structures = ', '.join(f'{name}={size}' for name, size in sizes.items())
+        print(f"Soak {record['elapsed'] / 60:6.1f}min: rss {record['rss'] / MB:.1f}MB, "
+              f"traced {traced / MB:.1f}MB | {structures}")
+
+    def report(self):
+        """Print the growth summary. Returns True if the run passed"""
+        if len(self.samples) < 2:
+            print("Soak: not enough samples for a verdict")
+            return True
+
+        base_snapshot, base = self.baseline
+        last = self.samples[-1]
+        rss_growth = last['rss'] - base['rss']
+        traced_growth = last['traced'] - base['traced']
+        print(f"\n=== SOAK REPORT ({last['elapsed'] / 3600:.2f}h) ===")
+        print(f"RSS growth: {rss_growth / MB:+.1f}MB, traced growth: {traced_growth / MB:+.1f}MB "
+              f"(threshold {self.threshold / MB:.0f}MB)")
+        for name in last['sizes']:
+            print(f"  {name}: {base['sizes'][name]} -> {last['sizes'][name]}")
+
+        print("Top growing allocation sites:")
+        for stat in self.last_snapshot.compare_to(base_snapshot, 'lineno')[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            print(f"  {stat.size_diff / 1024:+.1f}KB ({stat.count_diff:+d} blocks) {stat.traceback}")
+
+        passed = rss_growth <= self.threshold and traced_growth <= self.threshold
+        print("PASS" if passed else "FAIL: memory grew past the threshold")
+        return passed
@@ -0,0 +1,122 @@
+"""Pre-rendered sprites and a clipped alpha blit.
+
+Sprites are stored premultiplied (color * alpha, plus 1 - alpha) as float32 so
+drawing one is a single multiply-add over its footprint. Animated sprites are
+a short cycle of such frames picked by phase, rendered once at startup.
+
+Image sprites come from a `SpriteCache`: each PNG is resized once per output
+size and the result is kept on disk under the source's content hash and the
+target size, so later starts at the same resolution skip the resize.
+"""
+import hashlib
+import math
+import os
+
+import cv2
+import numpy as np
+
+
+class Sprite:
+    def __init__(self, bgra):
+        alpha = bgra[:, :, 3:4].astype(np.float32) / 255.0
+        self.premultiplied = bgra[:, :, :3].astype(np.float32) * alpha
+        self.inverse_alpha = 1.0 - alpha
+        self.height, self.width = bgra.shape[:2]
+
+    def blit(self, frame, x, y):
+        """Blend onto frame with the top-left corner at (x, y), clipped to the frame"""
+        frame_height, frame_width = frame.shape[:2]
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + self.width, frame_width), min(y + self.height, frame_height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        sx, sy = x1 - x, y1 - y
+        sw, sh = x2 - x1, y2 - y1
+        roi = frame[y1:y2, x1:x2]
+        roi[:] = (roi * self.inverse_alpha[sy:sy + sh, sx:sx + sw]
+                  + self.premultiplied[sy:sy + sh, sx:sx + sw]).astype(np.uint8)
+
+
+class SpriteCache:
+    """Sprites resized from source PNGs, cached in memory and on disk"""
+
+    def __init__(self, directory='.sprite_cache'):
+        self.directory = directory
+        self.sprites = {}
+
+    def load(self, path, size):
+        """Sprite for the image at path resized to size (w, h), None if it can't be read"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Could not read sprite {path}: {e}")
+            return None
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        key = (digest, tuple(size))
+        if key in self.sprites:
+            return self.sprites[key]
+
+        cached = os.path.join(self.directory, f'{digest}_{size[0]}x{size[1]}.png')
+        bgra = cv2.imread(cached, cv2.IMREAD_UNCHANGED) if os.path.exists(cached) else None
+        if bgra is None:
+            source = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            if source is None:
+                print(f"Could not decode sprite {path}")
+                return None
+            if source.ndim == 2:
+                source = cv2.cvtColor(source, cv2.COLOR_GRAY2BGRA)
+            elif source.shape[2] == 3:
+                source = cv2.cvtColor(source, cv2.COLOR_BGR2BGRA)
+            bgra = cv2.resize(source, tuple(size), interpolation=cv2.INTER_AREA)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                cv2.imwrite(cached, bgra)
+            except (OSError, cv2.error) as e:
+                print(f"Could not cache sprite {path}: {e}")
+
+        sprite = Sprite(bgra)
+        self.sprites[key] = sprite
+        return sprite
+
+
+class AnimatedSprite:
+    """A looping cycle of sprite frames, selected by time"""
+
+    def __init__(self, frames, period):
+        self.frames = frames
+        self.period = period
+
+    def frame_at(self, t):
+        phase = int(t / self.period * len(self.frames)) % len(self.frames)
+        return self.frames[phase]
+
+    def draw(self, frame, center_x, center_y, t):
+        sprite = self.frame_at(t)
+        sprite.blit(frame, center_x - sprite.width // 2, center_y - sprite.height // 2)
+
+
+def render_powerup_sprite(color, label, size, pulse=20, phases=16, speed=5):
+    """Render a pulsing power-up disc with its label, one frame per phase.
+
+    Matches the old per-frame drawing: diameter size + pulse * sin(speed * t),
+    a white rim and a black label. Rim and label scale with size (50 is the
+    original design size).
+    """
+    canvas = size + pulse + 4
+    center = canvas // 2
+    scale = size / 50
+    label_scale = (0.8 if len(label) == 1 else 0.6) * scale
+    thickness = max(1, round(2 * scale))
+    (text_width, text_height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, label_scale, thickness)
+
+    frames = []
+    for phase in range(phases):
+        diameter = size + int(pulse * math.sin(2 * math.pi * phase / phases))
+        bgra = np.zeros((canvas, canvas, 4), dtype=np.uint8)
+        cv2.circle(bgra, (center, center), diameter // 2, (*color, 255), -1, cv2.LINE_AA)
+        cv2.circle(bgra, (center, center), diameter // 2, (255, 255, 255, 255), thickness, cv2.LINE_AA)
+        cv2.putText(bgra, label, (center - text_width // 2, center + text_height // 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, label_scale, (0, 0, 0, 255), thickness, cv2.LINE_AA)
+        frames.append(Sprite(bgra))
+    return AnimatedSprite(frames, period=2 * math.pi / speed)
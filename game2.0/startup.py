@@ -0,0 +1,82 @@
+"""Parallel startup: load assets, open the camera and warm up the hand model.
+
+Each loading step runs as a background task while the main thread keeps a
+"loading" frame on screen, so the window appears immediately and the slowest
+step (usually the camera or MediaPipe) sets the time to playable instead of
+the sum of all of them.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from layout import Layout
+
+
+def warm_up_hands(hands, width=640, height=480):
+    """Run one inference on a blank frame so the first real frame doesn't hitch"""
+    hands.process(np.zeros((height, width, 3), dtype=np.uint8))
+
+
+class Startup:
+    """Runs named loading tasks in parallel and records how long each took"""
+
+    def __init__(self, display, size=(1280, 720)):
+        self.display = display
+        self.size = size
+        self.start_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='startup')
+        self.tasks = {}
+        self.required = set()
+        self.timings = {}
+        self.missing = []  # Required tasks that failed, filled in by wait()
+
+    def _timed(self, name, func, args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def submit(self, name, func, *args, required=False):
+        """Start a task; a required one fails if it raises or returns None"""
+        self.tasks[name] = self.executor.submit(self._timed, name, func, args)
+        if required:
+            self.required.add(name)
+
+    def show_loading(self):
+        """Draw the loading screen with the state of every task"""
+        width, height = self.size
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        ui = Layout(width, height)
+        ui.text(frame, 'LOADING...', ui.point(0.5, 0.5, -120, -40), 1.5, (0, 215, 255), 3)
+        y_pos = 10
+        for name, task in self.tasks.items():
+            status = 'done' if task.done() else '...'
+            ui.text(frame, f'{name}: {status}', ui.point(0.5, 0.5, -100, y_pos), 0.7, (255, 255, 255), 2)
+            y_pos += 30
+        self.display.show(frame)
+        self.display.poll_key(1)
+
+    def wait(self):
+        """Keep the loading screen alive until every task finishes, return results"""
+        while not all(task.done() for task in self.tasks.values()):
+            self.show_loading()
+            time.sleep(0.05)
+        self.executor.shutdown(wait=True)
+
+        results = {}
+        for name, task in self.tasks.items():
+            try:
+                results[name] = task.result()
+            except Exception as e:
+                print(f"Startup task '{name}' failed: {e}")
+                results[name] = None
+        self.missing = [name for name in self.tasks if name in self.required and results[name] is None]
+        self.timings['total'] = time.perf_counter() - self.start_time
+        return results
+
+    def report(self):
+        phases = ', '.join(f'{name} {seconds:.2f}s' for name, seconds in self.timings.items()
+                           if name != 'total')
+        print(f"Startup: {phases} | ready in {self.timings.get('total', 0):.2f}s")